@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Trailing-Zero Alignment Kernels
+Vectorised 2-adic valuations v2(n+1) and v2(3n+1) over odd windows
+n = shift + 2*offset, with marginal and joint histograms from np.bincount
+"""
+
+import numpy as np
+from typing import Sequence, Tuple
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.shift_window import shift_window
+
+# De Bruijn multiplier: (lowest set bit * DEBRUIJN64) >> 58 is unique per bit
+DEBRUIJN64 = 0x03F79D71B4CB0A89
+_DEBRUIJN_POSITION = np.zeros(64, dtype=np.int64)
+for _bit in range(64):
+    _DEBRUIJN_POSITION[(((1 << _bit) * DEBRUIJN64) & (2**64 - 1)) >> 58] = _bit
+
+# Samples evaluated per vectorised pass
+DEFAULT_CHUNK = 2**22
+
+
+def trailing_zeros_u64(values: np.ndarray) -> np.ndarray:
+    """Trailing zero count of each uint64 value (64 for zero)"""
+    values = np.asarray(values, dtype=np.uint64)
+    lowest = values & (~values + np.uint64(1))  # x & -x
+    zeros = _DEBRUIJN_POSITION[(lowest * np.uint64(DEBRUIJN64)) >> np.uint64(58)]
+    return np.where(values == 0, 64, zeros)
+
+
+def window_valuations(shift: int, first_offset: int, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (v2(n+1), v2(3n+1)) for n = shift + 2*(first_offset + i), i < count.
+
+    Only the low 64 bits of n are needed: arithmetic mod 2^64 keeps every
+    valuation below 64 exact, and the rare values whose low word is zero
+    are finished with Python integers.
+    """
+    shift = int(shift)
+    offsets = np.arange(first_offset, first_offset + count, dtype=np.int64)
+    low = np.uint64(shift & (2**64 - 1)) + (2 * offsets).astype(np.uint64)  # wraps mod 2^64
+    n_plus_1 = low + np.uint64(1)
+    three_n_plus_1 = low * np.uint64(3) + np.uint64(1)
+
+    tz_n_plus_1 = trailing_zeros_u64(n_plus_1)
+    tz_3n_plus_1 = trailing_zeros_u64(three_n_plus_1)
+    for i in np.nonzero(n_plus_1 == 0)[0].tolist():
+        tz_n_plus_1[i] = _valuation(shift + 2 * (first_offset + i) + 1)
+    for i in np.nonzero(three_n_plus_1 == 0)[0].tolist():
+        tz_3n_plus_1[i] = _valuation(3 * (shift + 2 * (first_offset + i)) + 1)
+    return tz_n_plus_1, tz_3n_plus_1
+
+
+def positive_window(shift: int, sample_size: int) -> Tuple[int, int]:
+    """
+    (first_offset, count) of the window offset in [-sample_size//2,
+    sample_size//2) restricted to n = shift + 2*offset > 0
+    """
+    window = shift_window(shift, sample_size)
+    return window.first_offset, len(window)
+
+
+class AlignmentAccumulator:
+    """
+    Streaming joint histogram of (v2(n+1), v2(3n+1)).
+
+    Samples are folded into a small dense count matrix (valuations of
+    64-bit words are below 64), so memory stays constant however many
+    chunks are consumed. Mutual information can be read off at any time,
+    and accumulators filled by separate workers merge by addition.
+    """
+
+    def __init__(self, width: int = 65):
+        self.joint = np.zeros((width, width), dtype=np.int64)
+
+    @property
+    def total(self) -> int:
+        return int(self.joint.sum())
+
+    def update(self, tz_n_plus_1: np.ndarray, tz_3n_plus_1: np.ndarray):
+        """Add one chunk of paired valuations"""
+        if not len(tz_n_plus_1):
+            return
+        width = max(self.joint.shape[0], int(tz_n_plus_1.max()) + 1, int(tz_3n_plus_1.max()) + 1)
+        self.joint = _pad(self.joint, width)
+        counts = np.bincount(tz_n_plus_1 * width + tz_3n_plus_1, minlength=width * width)
+        self.joint += counts.reshape(width, width)
+
+    def add_window(self, shift: int, first_offset: int, count: int, chunk: int = DEFAULT_CHUNK):
+        """Stream n = shift + 2*(first_offset + i), i < count, in chunks"""
+        for lo in range(first_offset, first_offset + count, chunk):
+            self.update(*window_valuations(shift, lo, min(chunk, first_offset + count - lo)))
+
+    def merge(self, other: 'AlignmentAccumulator') -> 'AlignmentAccumulator':
+        """Fold in the counts of another accumulator"""
+        width = max(self.joint.shape[0], other.joint.shape[0])
+        self.joint = _pad(self.joint, width) + _pad(other.joint, width)
+        return self
+
+    def marginals(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(counts of v2(n+1), counts of v2(3n+1))"""
+        return self.joint.sum(axis=1), self.joint.sum(axis=0)
+
+    def mutual_information(self) -> float:
+        """Plug-in mutual information (bits) of the counts so far"""
+        total = self.total
+        if not total:
+            return 0.0
+        rows, cols = np.nonzero(self.joint)
+        dist_n_plus_1, dist_3n_plus_1 = self.marginals()
+        p_joint = self.joint[rows, cols] / total
+        p_independent = (dist_n_plus_1[rows] / total) * (dist_3n_plus_1[cols] / total)
+        return float(np.sum(p_joint * np.log2(p_joint / p_independent)))
+
+
+def alignment_histograms(shift: int, sample_size: int,
+                         chunk: int = DEFAULT_CHUNK) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Histograms of v2(n+1) and v2(3n+1) over the positive odd window
+    n = shift + 2*offset, offset in [-sample_size//2, sample_size//2).
+
+    Returns (dist_n_plus_1, dist_3n_plus_1, joint) as count arrays indexed
+    by valuation; joint[a, b] counts samples with v2(n+1) = a, v2(3n+1) = b.
+    """
+    accumulator = AlignmentAccumulator()
+    accumulator.add_window(shift, *positive_window(shift, sample_size), chunk=chunk)
+    return (*accumulator.marginals(), accumulator.joint)
+
+
+def batch_mutual_information(centres: Sequence[int], sample_size: int,
+                             chunk: int = DEFAULT_CHUNK) -> np.ndarray:
+    """
+    Mutual information of v2(n+1) and v2(3n+1) over the positive odd window
+    of every centre, as AlignmentAccumulator would give per centre. Windows
+    are evaluated together as a (centres x sample_size) block, a few
+    centres per chunk samples.
+    """
+    centres = [int(c) for c in centres]
+    offsets = np.arange(-sample_size // 2, sample_size // 2, dtype=np.int64)
+    rows_per_block = max(1, chunk // max(1, len(offsets)))
+    result = np.zeros(len(centres))
+
+    for lo in range(0, len(centres), rows_per_block):
+        block = centres[lo:lo + rows_per_block]
+        rows = len(block)
+        firsts = np.array([positive_window(c, sample_size)[0] for c in block], dtype=np.int64)
+        valid = offsets[None, :] >= firsts[:, None]
+        low = (np.array([c & (2**64 - 1) for c in block], dtype=np.uint64)[:, None]
+               + (2 * offsets).astype(np.uint64)[None, :])
+        n_plus_1 = low + np.uint64(1)
+        three_n_plus_1 = low * np.uint64(3) + np.uint64(1)
+        tz_n_plus_1 = trailing_zeros_u64(n_plus_1)
+        tz_3n_plus_1 = trailing_zeros_u64(three_n_plus_1)
+        for r, i in zip(*np.nonzero(n_plus_1 == 0)):
+            tz_n_plus_1[r, i] = _valuation(block[r] + 2 * int(offsets[i]) + 1)
+        for r, i in zip(*np.nonzero(three_n_plus_1 == 0)):
+            tz_3n_plus_1[r, i] = _valuation(3 * (block[r] + 2 * int(offsets[i])) + 1)
+
+        width = max(65, int(tz_n_plus_1.max()) + 1, int(tz_3n_plus_1.max()) + 1)
+        codes = (np.arange(rows)[:, None] * width + tz_n_plus_1) * width + tz_3n_plus_1
+        joint = np.bincount(codes[valid], minlength=rows * width * width).reshape(rows, width, width)
+
+        total = joint.sum(axis=(1, 2)).astype(float)
+        total[total == 0] = 1
+        p_joint = joint / total[:, None, None]
+        p_independent = p_joint.sum(axis=2)[:, :, None] * p_joint.sum(axis=1)[:, None, :]
+        nonzero = joint > 0
+        terms = np.zeros_like(p_joint)
+        terms[nonzero] = p_joint[nonzero] * np.log2(p_joint[nonzero] / p_independent[nonzero])
+        result[lo:lo + rows] = terms.sum(axis=(1, 2))
+    return result
+
+
+def _pad(matrix: np.ndarray, width: int) -> np.ndarray:
+    """Zero-pad a square count matrix to width x width"""
+    if matrix.shape[0] == width:
+        return matrix
+    padded = np.zeros((width, width), dtype=np.int64)
+    padded[:matrix.shape[0], :matrix.shape[1]] = matrix
+    return padded
+
+
+def _valuation(n: int) -> int:
+    return (n & -n).bit_length() - 1 if n else 0
@@ -5,68 +5,85 @@ Explores the relationship between binary representations and Collatz trajectorie
 """
 
 import numpy as np
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Iterable
 from collections import defaultdict
 import json
+from concurrent.futures import ProcessPoolExecutor
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.trajectory_engine import collatz_step
+from analysis.trajectory_cache import TrajectoryCache
 
 class CollatzBinaryAnalyzer:
-    def __init__(self):
-        self.trajectory_cache = {}
+    # Seeds computed per lockstep batch when scanning a range
+    prefetch_chunk = 4096
+    # Shards handed to each worker by a parallel range scan (load balancing)
+    shards_per_worker = 4
+    
+    def __init__(self, cache_bytes: int = 256 * 2**20):
+        self.trajectory_cache = TrajectoryCache(cache_bytes)
         self.pattern_database = defaultdict(list)
         
     def collatz_step(self, n: int) -> int:
         """Single Collatz step with binary insight"""
-        if n & 1:  # Check last bit for odd/even
-            return 3 * n + 1
-        else:
-            return n >> 1  # Right shift for division by 2
+        return collatz_step(n)
     
     def get_trajectory(self, n: int) -> List[int]:
-        """Generate full Collatz trajectory"""
-        if n in self.trajectory_cache:
-            return self.trajectory_cache[n]
-        
-        trajectory = [n]
-        current = n
-        while current != 1:
-            current = self.collatz_step(current)
-            trajectory.append(current)
-            if current in self.trajectory_cache:
-                # Use cached partial trajectory
-                trajectory.extend(self.trajectory_cache[current][1:])
-                break
-        
-        self.trajectory_cache[n] = trajectory
-        return trajectory
-    
-    def binary_analysis(self, n: int) -> Dict:
-        """Comprehensive binary analysis of a number's Collatz trajectory"""
+        """Generate full Collatz trajectory (cached links are reused)"""
+        return self.trajectory_cache.trajectory(n)
+    
+    def prefetch_trajectories(self, numbers: Iterable[int]):
+        """Compute all uncached trajectories for numbers in one lockstep batch"""
+        self.trajectory_cache.prefetch(numbers)
+    
+    def binary_analysis(self, n: int, as_arrays: bool = False) -> Dict:
+        """
+        Comprehensive binary analysis of a number's Collatz trajectory.
+        With as_arrays=True, bit_lengths, hamming_weights and the transition
+        fields are returned as NumPy arrays instead of lists of dicts.
+        """
         trajectory = self.get_trajectory(n)
+        count = len(trajectory)
+        
+        # Integer-native bit statistics: no string round-trips
+        bit_lengths = [x.bit_length() for x in trajectory]
+        hamming_weights = [x.bit_count() for x in trajectory]
+        bits_changed = [(x ^ y).bit_count() for x, y in zip(trajectory, trajectory[1:])]  # popcount of XOR
+        bit_diff = [b - a for a, b in zip(bit_lengths, bit_lengths[1:])]
+        odd = [x & 1 for x in trajectory[:-1]]
+        
+        if as_arrays:
+            bit_transitions = {
+                'step': np.arange(count - 1),
+                'odd': np.array(odd, dtype=bool),
+                'bits_changed': np.array(bits_changed, dtype=np.int64),
+                'bit_diff': np.array(bit_diff, dtype=np.int64)
+            }
+            bit_lengths = np.array(bit_lengths, dtype=np.int64)
+            hamming_weights = np.array(hamming_weights, dtype=np.int64)
+        else:
+            bit_transitions = [
+                {
+                    'step': i,
+                    'operation': '3n+1' if odd[i] else 'n/2',
+                    'bits_changed': bits_changed[i],
+                    'bit_diff': bit_diff[i]
+                }
+                for i in range(count - 1)
+            ]
         
         analysis = {
             'start': n,
             'start_binary': bin(n)[2:],
-            'trajectory_length': len(trajectory),
+            'trajectory_length': count,
             'binary_trajectory': [bin(x)[2:] for x in trajectory],
-            'bit_lengths': [len(bin(x)[2:]) for x in trajectory],
-            'bit_transitions': [],
-            'hamming_weights': [bin(x).count('1') for x in trajectory],
+            'bit_lengths': bit_lengths,
+            'bit_transitions': bit_transitions,
+            'hamming_weights': hamming_weights,
             'resonance_score': 0
         }
         
-        # Analyze bit transitions
-        for i in range(len(trajectory) - 1):
-            curr_bits = bin(trajectory[i])[2:].zfill(64)
-            next_bits = bin(trajectory[i+1])[2:].zfill(64)
-            
-            transition = {
-                'step': i,
-                'operation': '3n+1' if trajectory[i] & 1 else 'n/2',
-                'bits_changed': sum(c != n for c, n in zip(curr_bits, next_bits)),
-                'bit_diff': trajectory[i+1].bit_length() - trajectory[i].bit_length()
-            }
-            analysis['bit_transitions'].append(transition)
-        
         # Calculate resonance score based on bit pattern periodicity
         analysis['resonance_score'] = self._calculate_resonance(trajectory)
         
@@ -76,35 +93,89 @@ class CollatzBinaryAnalyzer:
         """
         Calculate a resonance score based on repeating binary patterns.
         Higher scores indicate more regular/resonant behavior.
+        
+        For each pattern length p the score counts positions i where the
+        parity block [i, i+p) repeats immediately. With the parities packed
+        into one integer, the shifted XOR marks mismatches t (parity[t] !=
+        parity[t+p]) and AND-ing p shifted copies of the complement leaves
+        exactly the positions whose whole window matches.
         """
-        if len(trajectory) < 3:
+        length = len(trajectory)
+        if length < 3:
             return 0.0
         
-        # Look for repeating patterns in bit parity sequence
-        parity_sequence = [x & 1 for x in trajectory]
-        
-        # Find repeating subsequences
-        pattern_scores = []
-        for pattern_len in range(2, min(len(parity_sequence) // 2, 10)):
-            matches = 0
-            for i in range(len(parity_sequence) - pattern_len):
-                if parity_sequence[i:i+pattern_len] == parity_sequence[i+pattern_len:i+2*pattern_len]:
-                    matches += 1
-            if matches > 0:
-                pattern_scores.append(matches * pattern_len)
-        
-        return sum(pattern_scores) / len(trajectory) if pattern_scores else 0.0
-    
-    def find_binary_patterns(self, start: int, end: int) -> Dict:
-        """Discover interesting binary patterns in a range"""
-        patterns = {
-            'palindromic_trajectories': [],
-            'power_of_2_encounters': defaultdict(int),
-            'high_resonance': [],
-            'bit_length_sequences': defaultdict(list)
-        }
+        parity = np.fromiter((x & 1 for x in trajectory), dtype=np.uint8, count=length)
+        packed = int.from_bytes(np.packbits(parity, bitorder='little').tobytes(), 'little')
+        
+        score = 0
+        for pattern_len in range(2, min(length // 2, 10)):
+            repeats = ~(packed ^ (packed >> pattern_len))
+            runs = repeats
+            for shift in range(1, pattern_len):
+                runs &= repeats >> shift
+            # A full repeat starting at i needs i + 2p <= L
+            score += (runs & ((1 << (length - 2 * pattern_len + 1)) - 1)).bit_count() * pattern_len
+        
+        return score / length
+    
+    def resonance_scores(self, trajectories: List[List[int]]) -> np.ndarray:
+        """
+        Resonance scores of many trajectories at once, equal to
+        [self._calculate_resonance(t) for t in trajectories].
+        All parities are concatenated into one uint8 array; windows that
+        would cross into the next trajectory are masked out.
+        """
+        lengths = np.array([len(t) for t in trajectories], dtype=np.int64)
+        scores = np.zeros(len(trajectories))
+        if not lengths.sum():
+            return scores
+        
+        parity = np.fromiter((x & 1 for t in trajectories for x in t), dtype=np.uint8, count=lengths.sum())
+        row = np.repeat(np.arange(len(trajectories)), lengths)
+        position = np.arange(len(parity)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        
+        totals = np.zeros(len(trajectories), dtype=np.int64)
+        for pattern_len in range(2, 10):
+            mismatch = np.concatenate(([0], np.cumsum(parity[:-pattern_len] != parity[pattern_len:])))
+            window = mismatch[pattern_len:] - mismatch[:-pattern_len]
+            starts = row[:len(window)]
+            # Full repeats start at i <= L - 2p, only for pattern lengths below L // 2
+            valid = ((position[:len(window)] <= lengths[starts] - 2 * pattern_len)
+                     & (lengths[starts] // 2 > pattern_len))
+            totals += np.bincount(starts[valid & (window == 0)], minlength=len(trajectories)) * pattern_len
+        
+        scored = lengths >= 3
+        scores[scored] = totals[scored] / lengths[scored]
+        return scores
+    
+    def find_binary_patterns(self, start: int, end: int, workers: int = 1) -> Dict:
+        """
+        Discover interesting binary patterns in a range.
+        With workers > 1 (None = all cores) the range is split into shards
+        scanned by a process pool; merged output is identical to the serial scan.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or end - start < self.prefetch_chunk:
+            return self._scan_range(start, end)
+        
+        shards = _split_range(start, end, workers * self.shards_per_worker, self.prefetch_chunk)
+        patterns = _empty_patterns()
+        cache_bytes = self.trajectory_cache.max_bytes // workers
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_scan_shard, [(lo, hi, cache_bytes) for lo, hi in shards])
+            for shard_patterns in results:  # map() yields in shard order
+                _merge_patterns(patterns, shard_patterns)
+        return patterns
+    
+    def _scan_range(self, start: int, end: int) -> Dict:
+        """Serial scan of [start, end] behind find_binary_patterns"""
+        patterns = _empty_patterns()
         
         for n in range(start, end + 1):
+            if (n - start) % self.prefetch_chunk == 0:
+                self.prefetch_trajectories(range(n, min(n + self.prefetch_chunk, end + 1)))
+            
             analysis = self.binary_analysis(n)
             
             # Check for palindromic binary at any point
@@ -141,6 +212,51 @@ class CollatzBinaryAnalyzer:
         with open(filename, 'w') as f:
             json.dump(analysis, f, indent=2)
         print(f"Analysis exported to {filename}")
+    
+    def export_range(self, start: int, end: int, filename: str, **options) -> int:
+        """
+        Stream per-seed summaries of [start, end] to a Parquet/Arrow file
+        in bounded row groups (see analysis.range_export.export_range)
+        """
+        from analysis.range_export import export_range
+        rows = export_range(self, start, end, filename, **options)
+        print(f"{rows} summary rows exported to {filename}")
+        return rows
+
+# ----------------------------------------------------------------------
+# Sharded range scans
+# ----------------------------------------------------------------------
+
+def _empty_patterns() -> Dict:
+    return {
+        'palindromic_trajectories': [],
+        'power_of_2_encounters': defaultdict(int),
+        'high_resonance': [],
+        'bit_length_sequences': defaultdict(list)
+    }
+
+def _split_range(start: int, end: int, shards: int, align: int) -> List[Tuple[int, int]]:
+    """Split [start, end] into about `shards` consecutive inclusive ranges"""
+    size = -(-(end - start + 1) // shards)
+    size = max(align, -(-size // align) * align)
+    return [(lo, min(lo + size - 1, end)) for lo in range(start, end + 1, size)]
+
+def _scan_shard(args: Tuple[int, int, int]) -> Dict:
+    """Worker entry point: serial scan of one shard in a fresh analyzer"""
+    start, end, cache_bytes = args
+    return CollatzBinaryAnalyzer(cache_bytes)._scan_range(start, end)
+
+def _merge_patterns(patterns: Dict, shard: Dict):
+    """
+    Fold the patterns of the next shard into patterns. Merging shards in
+    range order reproduces the serial scan, including key order.
+    """
+    patterns['palindromic_trajectories'].extend(shard['palindromic_trajectories'])
+    for power, count in shard['power_of_2_encounters'].items():
+        patterns['power_of_2_encounters'][power] += count
+    patterns['high_resonance'].extend(shard['high_resonance'])
+    for key, numbers in shard['bit_length_sequences'].items():
+        patterns['bit_length_sequences'][key].extend(numbers)
 
 def demonstrate_binary_resonance():
     """Demonstrate key findings about binary patterns in Collatz sequences"""
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Per-Value Bit Features
+Bit length, popcount, density, Shannon entropy, information content and
+centre of mass of the 1 bits for every value of a trajectory, computed
+from its bit-plane matrix in a few array operations.
+"""
+
+import numpy as np
+from typing import Dict, List, Sequence
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.bit_planes import bit_planes
+
+FEATURES = ('bit_length', 'popcount', 'density', 'entropy', 'information', 'center_of_mass')
+
+# Plane entries per block of the position-sum product, which works in int64
+POSITION_BLOCK = 2**20
+
+
+def trajectory_features(trajectory: Sequence[int]) -> Dict[str, np.ndarray]:
+    """
+    Arrays with one entry per value of the trajectory:
+        bit_length     - len(bin(x)) - 2
+        popcount       - number of 1 bits
+        density        - popcount / bit_length
+        entropy        - binary Shannon entropy (bits) of the density, 0 when all bits agree
+        information    - bit_length * entropy
+        center_of_mass - mean position of the 1 bits (bit 0 = LSB), 0 for x = 0
+    """
+    planes = bit_planes(trajectory, msb_first=False)
+    width = planes.shape[1]
+    bit_length = np.where(planes.any(axis=1), width - np.argmax(planes[:, ::-1], axis=1), 0)
+    popcount = planes.sum(axis=1, dtype=np.int64)
+    # Row blocks keep the int64 copy of the planes small
+    positions = np.arange(width, dtype=np.int64)
+    position_sum = np.empty(len(planes), dtype=np.int64)
+    rows = max(1, POSITION_BLOCK // max(width, 1))
+    for start in range(0, len(planes), rows):
+        position_sum[start:start + rows] = planes[start:start + rows] @ positions
+
+    safe_length = np.maximum(bit_length, 1)
+    p1 = popcount / safe_length
+    p0 = (bit_length - popcount) / safe_length
+    mixed = (popcount > 0) & (popcount < bit_length)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        entropy = np.where(mixed, -(p1 * np.log2(p1) + p0 * np.log2(p0)), 0.0)
+        center_of_mass = np.where(popcount > 0, position_sum / np.maximum(popcount, 1), 0.0)
+
+    return {
+        'bit_length': bit_length.astype(np.int64),
+        'popcount': popcount,
+        'density': np.where(bit_length > 0, p1, 0.0),
+        'entropy': entropy,
+        'information': bit_length * entropy,
+        'center_of_mass': center_of_mass
+    }
+
+
+def batch_features(trajectories: Sequence[Sequence[int]]) -> List[Dict[str, np.ndarray]]:
+    """trajectory_features for many trajectories: one pass over all values, then split per seed"""
+    flat = trajectory_features([x for trajectory in trajectories for x in trajectory])
+    bounds = np.cumsum([len(trajectory) for trajectory in trajectories])[:-1]
+    split = {name: np.split(values, bounds) for name, values in flat.items()}
+    return [{name: split[name][i] for name in FEATURES} for i in range(len(trajectories))]
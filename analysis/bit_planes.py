@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Bit-Plane Matrices
+Trajectories as uint8 matrices with one row per value and one column per
+bit, unpacked from the integers' bytes with np.unpackbits rather than
+parsed from bin() strings. Any width works, including past 64 bits.
+"""
+
+import numpy as np
+from typing import Optional, Sequence
+
+
+def bit_planes(values: Sequence[int], width: Optional[int] = None, msb_first: bool = True) -> np.ndarray:
+    """
+    (len(values), width) uint8 matrix of the low `width` bits of each value
+    (default: the widest value's bit length). Columns run from the most
+    significant bit down, as in bin(x).zfill(width), or from bit 0 up with
+    msb_first=False so that column j is bit j.
+    """
+    values = [int(v) for v in values]
+    if width is None:
+        width = max((v.bit_length() for v in values), default=0) or 1
+    if not values:
+        return np.zeros((0, width), dtype=np.uint8)
+
+    if width <= 64 and all(0 <= v < 2**64 for v in values):
+        raw = np.array(values, dtype='<u8').view(np.uint8)
+        nbytes = 8
+    else:
+        nbytes = (width + 7) // 8
+        mask = (1 << (8 * nbytes)) - 1
+        raw = np.frombuffer(b''.join((v & mask).to_bytes(nbytes, 'little') for v in values), dtype=np.uint8)
+    planes = np.unpackbits(raw.reshape(len(values), nbytes), axis=1, bitorder='little')[:, :width]
+    return planes[:, ::-1] if msb_first else planes
+
+
+def batch_bit_planes(trajectories: Sequence[Sequence[int]], width: Optional[int] = None,
+                     msb_first: bool = True) -> np.ndarray:
+    """
+    (len(trajectories), longest trajectory, width) stack of bit_planes with
+    a shared width; rows past the end of a shorter trajectory are zero.
+    """
+    if width is None:
+        width = max((int(v).bit_length() for t in trajectories for v in t), default=0) or 1
+    longest = max((len(t) for t in trajectories), default=0)
+    stack = np.zeros((len(trajectories), longest, width), dtype=np.uint8)
+    # One unpack for every value of every trajectory, then scattered into place
+    flat = bit_planes([v for t in trajectories for v in t], width, msb_first)
+    rows = np.concatenate([np.arange(len(t)) for t in trajectories]) if len(flat) else np.zeros(0, dtype=np.int64)
+    owners = np.repeat(np.arange(len(trajectories)), [len(t) for t in trajectories])
+    stack[owners, rows] = flat
+    return stack
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Factor Database for s_n
+Factorisations, totients and primality of s_n = (2^(2n+1) + 1)/3, filled
+lazily and kept in sqlite so expensive factorisations are done once.
+
+New entries use the cyclotomic splitting of 2^(4n+2) - 1: with m = 2n+1,
+    2^m + 1 = prod_{e | m} Phi_{2e}(2),   Phi_2(2) = 3,
+so s_n is the product of Phi_{2e}(2) over the divisors e > 1 of m. Each
+cyclotomic factor is much smaller than s_n, is factored once and is
+shared by every n whose 2n+1 has e as a divisor.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from typing import Dict
+from sympy import factorint, isprime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.multiplicative_order import factorize
+from analysis.shift_sequence import SHIFTS
+
+# Where default_factor_db() keeps its entries (setup.sh creates data/)
+DEFAULT_FACTOR_DB_PATH = os.environ.get(
+    'COLLATZ_FACTOR_DB',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'factors.sqlite')
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cyclotomic (
+    d INTEGER PRIMARY KEY,      -- Phi_d(2)
+    factors TEXT NOT NULL       -- JSON {prime: exponent}, primes as strings
+);
+CREATE TABLE IF NOT EXISTS shift_factors (
+    n INTEGER PRIMARY KEY,      -- s_n
+    factors TEXT,               -- JSON {prime: exponent}, NULL until factored
+    totient TEXT,
+    is_prime INTEGER,           -- NULL until tested
+    certificate TEXT            -- how primality was decided
+);
+"""
+
+
+class FactorDatabase:
+    """
+    Lazily populated factor store for s_n, keyed by n.
+
+    factorization(n), totient(n) and is_prime(n) answer from the database
+    when possible and otherwise compute, store and commit the entry.
+    Primality does not need a factorisation: when 2n+1 is composite, any
+    divisor e gives the algebraic factor Phi_2e(2) as a certificate.
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def factorization(self, n: int) -> Dict[int, int]:
+        """Prime factorisation {p: k} of s_n, in ascending order of p"""
+        row = self._row(n)
+        if row and row[0] is not None:
+            return _decode(row[0])
+
+        factors: Dict[int, int] = {}
+        for e in _divisors(2 * n + 1):
+            if e > 1:
+                for p, k in self._cyclotomic_factors(2 * e).items():
+                    factors[p] = factors.get(p, 0) + k
+        factors = dict(sorted(factors.items()))
+
+        totient = 1
+        for p, k in factors.items():
+            totient *= p**(k - 1) * (p - 1)
+        self._upsert(n, factors=json.dumps({str(p): k for p, k in factors.items()}), totient=str(totient))
+        return factors
+
+    def totient(self, n: int) -> int:
+        """Euler's totient of s_n"""
+        row = self._row(n)
+        if not row or row[1] is None:
+            self.factorization(n)
+            row = self._row(n)
+        return int(row[1])
+
+    def is_prime(self, n: int) -> bool:
+        """Whether s_n is prime, with the reason stored as its certificate"""
+        row = self._row(n)
+        if row and row[2] is not None:
+            return bool(row[2])
+
+        m = 2 * n + 1
+        s_n = SHIFTS[n]
+        if n == 0:
+            prime, certificate = False, "s_0 = 1"
+        elif row and row[0] is not None:
+            factors = _decode(row[0])
+            prime = factors == {s_n: 1}
+            certificate = "factorization"
+        elif not isprime(m):
+            e = min(factorize(m))
+            prime, certificate = False, f"algebraic factor Phi_{2 * e}(2)"
+        else:
+            prime = isprime(s_n)
+            certificate = "BPSW (deterministic below 2^64)" if s_n < 2**64 else "BPSW probable prime"
+        self._upsert(n, is_prime=int(prime), certificate=certificate)
+        return prime
+
+    def certificate(self, n: int) -> str:
+        """How the primality of s_n was decided"""
+        self.is_prime(n)
+        return self._row(n)[3]
+
+    def close(self):
+        self.connection.close()
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _cyclotomic_factors(self, d: int) -> Dict[int, int]:
+        row = self.connection.execute("SELECT factors FROM cyclotomic WHERE d = ?", (d,)).fetchone()
+        if row:
+            return _decode(row[0])
+        factors = {int(p): k for p, k in factorint(cyclotomic_value(d)).items()}
+        self.connection.execute("INSERT INTO cyclotomic (d, factors) VALUES (?, ?)",
+                                (d, json.dumps({str(p): k for p, k in factors.items()})))
+        self.connection.commit()
+        return factors
+
+    def _row(self, n: int):
+        return self.connection.execute(
+            "SELECT factors, totient, is_prime, certificate FROM shift_factors WHERE n = ?", (n,)
+        ).fetchone()
+
+    def _upsert(self, n: int, **columns):
+        self.connection.execute("INSERT OR IGNORE INTO shift_factors (n) VALUES (?)", (n,))
+        assignments = ", ".join(f"{name} = ?" for name in columns)
+        self.connection.execute(f"UPDATE shift_factors SET {assignments} WHERE n = ?",
+                                (*columns.values(), n))
+        self.connection.commit()
+
+
+def cyclotomic_value(d: int) -> int:
+    """Phi_d(2) = prod_{k | d} (2^k - 1)^mu(d/k)"""
+    numerator, denominator = 1, 1
+    for k in _divisors(d):
+        mu = _mobius(d // k)
+        if mu == 1:
+            numerator *= (1 << k) - 1
+        elif mu == -1:
+            denominator *= (1 << k) - 1
+    return numerator // denominator
+
+
+def _divisors(m: int):
+    divisors = [1]
+    for p, k in factorize(m).items():
+        divisors = [d * p**i for d in divisors for i in range(k + 1)]
+    return sorted(divisors)
+
+
+def _mobius(m: int) -> int:
+    factors = factorize(m)
+    if any(k > 1 for k in factors.values()):
+        return 0
+    return -1 if len(factors) % 2 else 1
+
+
+def _decode(text: str) -> Dict[int, int]:
+    return {int(p): k for p, k in json.loads(text).items()}
+
+
+_default_factor_db = None
+
+
+def default_factor_db() -> FactorDatabase:
+    """
+    Shared database used by the analysis scripts: stored at
+    DEFAULT_FACTOR_DB_PATH when the data/ directory exists, else in memory.
+    """
+    global _default_factor_db
+    if _default_factor_db is None:
+        if os.path.isdir(os.path.dirname(DEFAULT_FACTOR_DB_PATH)):
+            _default_factor_db = FactorDatabase(DEFAULT_FACTOR_DB_PATH)
+        else:
+            _default_factor_db = FactorDatabase()
+    return _default_factor_db
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Multi-Step Jump Table (k-bit sieve)
+The low k bits of n fix the next k parity steps, so k steps of the map
+T(n) = (3n+1)/2 (odd) or n/2 (even) collapse into one affine jump:
+
+    T^k(2^k a + r) = 3^c(r) * a + T^k(r)
+
+where c(r) counts the odd steps taken by r. Each jump replaces k + c(r)
+ordinary Collatz steps.
+"""
+
+import numpy as np
+from typing import Sequence, Tuple
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.stopping_times import StoppingTimeTable
+
+UINT64_MAX = 2**64 - 1
+
+
+class JumpTable:
+    """
+    Precomputed k-step jumps for every residue r mod 2^k.
+
+    Per residue it stores the odd-step count c(r), the tail T^k(r), the
+    coefficient stopping time (first j with 3^c_j < 2^j, which is where a
+    trajectory can first drop below its start) and the single affine line
+    a -> A*a + B that bounds every 3n+1 value inside the jump, so peaks stay
+    exact. Values below the tail table's bound are answered from that table.
+    """
+
+    def __init__(self, k: int = 16, tail_table: StoppingTimeTable = None):
+        if tail_table is None:
+            tail_table = StoppingTimeTable(bound=2**k, max_bound=2**k)
+        if tail_table.bound < 2**k:
+            raise ValueError(f"tail table must cover n < 2^{k}")
+        self.k = k
+        self.mask = (1 << k) - 1
+        self.tail_table = tail_table
+        self.pow3 = [3**i for i in range(k + 1)]
+        # Jumps taken by the scalar queries, and Collatz steps spent building, for throughput metrics
+        self.jumps = 0
+        self.build_steps = k << k
+        self._build()
+
+    def _build(self):
+        k = self.k
+        size = 1 << k
+        tail = np.arange(size, dtype=np.uint64)
+        odd_count = np.zeros(size, dtype=np.int64)
+        pow3 = np.array(self.pow3, dtype=np.uint64)
+
+        stop_step = np.zeros(size, dtype=np.int64)      # coefficient stopping time j0
+        stop_odd = np.zeros(size, dtype=np.int64)       # c_j0
+        stop_tail = np.zeros(size, dtype=np.uint64)     # T^j0(r)
+        peak_a = np.zeros(size, dtype=np.uint64)
+        peak_b = np.zeros(size, dtype=np.uint64)
+        line_a = []
+        line_b = []
+
+        for j in range(1, k + 1):
+            odd = (tail & 1).astype(bool)
+            tail = np.where(odd, (tail * 3 + 1) >> 1, tail >> 1)
+            odd_count += odd
+
+            # 3n+1 value before the halving: 2 * T^j(n) = 3^c 2^(k-j+1) a + 2 T^j(r)
+            scale = np.uint64(1 << (k - j + 1))
+            a_j = np.where(odd, pow3[odd_count] * scale, 0).astype(np.uint64)
+            b_j = np.where(odd, tail * 2, 0).astype(np.uint64)
+            line_a.append(a_j)
+            line_b.append(b_j)
+            better = (a_j > peak_a) | ((a_j == peak_a) & (b_j > peak_b))
+            peak_a = np.where(better, a_j, peak_a)
+            peak_b = np.where(better, b_j, peak_b)
+
+            first = (stop_step == 0) & (pow3[odd_count] < np.uint64(1 << j))
+            stop_step[first] = j
+            stop_odd[first] = odd_count[first]
+            stop_tail[first] = tail[first]
+
+        # The steepest line must also be highest at a = 1 to dominate for all a >= 1;
+        # keep every line for the (in practice absent) residues where it is not
+        dominates = np.ones(size, dtype=bool)
+        for a_j, b_j in zip(line_a, line_b):
+            dominates &= peak_a + peak_b >= a_j + b_j
+        self._extra_lines = {
+            r: [(int(a[r]), int(b[r])) for a, b in zip(line_a, line_b) if a[r]]
+            for r in np.nonzero(~dominates)[0].tolist()
+        }
+
+        self.odd_count = odd_count.tolist()
+        self.tail = tail.tolist()
+        self.stop_step = stop_step.tolist()
+        self.stop_odd = stop_odd.tolist()
+        self.stop_tail = stop_tail.tolist()
+        self.peak_a = peak_a.tolist()
+        self.peak_b = peak_b.tolist()
+        self._max_tail = int(tail.max())
+
+    # ------------------------------------------------------------------
+    # Scalar queries
+    # ------------------------------------------------------------------
+
+    def total_stopping_time(self, n: int) -> int:
+        """Steps for n to reach 1"""
+        k, mask, bound = self.k, self.mask, self.tail_table.bound
+        odd_count, tail, pow3 = self.odd_count, self.tail, self.pow3
+        steps = 0
+        while n >= bound:
+            r = n & mask
+            c = odd_count[r]
+            n = pow3[c] * (n >> k) + tail[r]
+            steps += k + c
+            self.jumps += 1
+        return steps + self.tail_table.lookup(n)[0]
+
+    def summary(self, n: int) -> Tuple[int, int, int]:
+        """(total stopping time, peak, stopping time), as StoppingTimeTable.lookup"""
+        if n < self.tail_table.bound:
+            return self.tail_table.lookup(n)
+
+        k, mask, bound = self.k, self.mask, self.tail_table.bound
+        odd_count, tail, pow3 = self.odd_count, self.tail, self.pow3
+        start = n
+        steps = 0
+        peak = n
+        while n >= bound:
+            r = n & mask
+            a = n >> k
+            if r in self._extra_lines:
+                peak = max(peak, max(la * a + lb for la, lb in self._extra_lines[r]))
+            else:
+                peak = max(peak, self.peak_a[r] * a + self.peak_b[r])
+            c = odd_count[r]
+            n = pow3[c] * a + tail[r]
+            steps += k + c
+            self.jumps += 1
+        total, tail_peak, _ = self.tail_table.lookup(n)
+        return steps + total, max(peak, tail_peak), self.stopping_time(start)
+
+    def stopping_time(self, n: int) -> int:
+        """First step at which the trajectory of n drops below n"""
+        if n < 2**self.k:
+            return self.tail_table.lookup(n)[2]
+        if not n & 1:
+            return 1
+        r = n & self.mask
+        j = self.stop_step[r]
+        if j:
+            # No T-value can drop below n before j; check the value at j exactly
+            c = self.stop_odd[r]
+            value = self.pow3[c] * ((n >> self.k) << (self.k - j)) + self.stop_tail[r]
+            if value < n:
+                return j + c
+        # Rare: the drop happens later than the coefficient stopping time
+        current, steps = n, 0
+        while current >= n:
+            current = 3 * current + 1 if current & 1 else current >> 1
+            steps += 1
+        return steps
+
+    # ------------------------------------------------------------------
+    # Batched sweep
+    # ------------------------------------------------------------------
+
+    def batch_total_stopping_times(self, starts: Sequence[int]) -> np.ndarray:
+        """
+        Total stopping times for many starting values, jumping in lockstep
+        over a uint64 array. Seeds whose next jump would overflow 64 bits
+        finish in total_stopping_time().
+        """
+        starts = [int(s) for s in starts]
+        k = self.k
+        bound = self.tail_table.bound
+        odd_count = np.array(self.odd_count, dtype=np.int64)
+        tail = np.array(self.tail, dtype=np.uint64)
+        pow3 = np.array(self.pow3, dtype=np.uint64)
+        # Largest a for which 3^c * a + tail still fits in 64 bits
+        safe_a = np.array([(UINT64_MAX - self._max_tail) // p for p in self.pow3], dtype=np.uint64)
+
+        steps = np.zeros(len(starts), dtype=np.int64)
+        finals = np.zeros(len(starts), dtype=np.uint64)
+        big = [i for i, s in enumerate(starts) if s > UINT64_MAX]
+        for i in big:
+            steps[i] = self.total_stopping_time(starts[i])
+
+        idx = np.array([i for i, s in enumerate(starts) if s <= UINT64_MAX], dtype=np.int64)
+        values = np.array([starts[i] for i in idx.tolist()], dtype=np.uint64)
+        finals[idx] = values
+        while idx.size:
+            active = values >= np.uint64(bound)
+            finals[idx[~active]] = values[~active]
+            idx, values = idx[active], values[active]
+            if not idx.size:
+                break
+
+            r = (values & np.uint64(self.mask)).astype(np.int64)
+            a = values >> np.uint64(k)
+            c = odd_count[r]
+            escape = a > safe_a[c]
+            if escape.any():
+                for i, v in zip(idx[escape].tolist(), values[escape].tolist()):
+                    steps[i] += self.total_stopping_time(v)
+                    finals[i] = 1
+                keep = ~escape
+                idx, values, r, a, c = idx[keep], values[keep], r[keep], a[keep], c[keep]
+
+            values = pow3[c] * a + tail[r]
+            steps[idx] += k + c
+
+        big_set = set(big)
+        small = [i for i in range(len(starts)) if i not in big_set]
+        steps[small] += self.tail_table.lookup_many(finals[small].tolist())[0]
+        return steps
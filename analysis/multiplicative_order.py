@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Multiplicative Order Service
+ord_m(a) from the factorisation of the group exponent: start from
+Carmichael's lambda(m) and divide out prime factors while a^(e/q) = 1.
+Small numbers are factored with a cached smallest-prime-factor sieve.
+"""
+
+import numpy as np
+from functools import lru_cache
+from math import gcd, isqrt
+from typing import Dict, Optional, Tuple
+
+# Sieve size built on first use; grows on demand up to MAX_SIEVE
+DEFAULT_SIEVE = 2**20
+MAX_SIEVE = 2**27
+
+# Memoised (a, m) -> order entries kept across calls
+ORDER_CACHE_SIZE = 2**18
+
+_spf = np.zeros(0, dtype=np.int32)
+
+
+def smallest_prime_factors(limit: int) -> np.ndarray:
+    """Cached table spf[k] = smallest prime factor of k, for k < limit"""
+    global _spf
+    if len(_spf) < limit:
+        size = max(limit, 2 * len(_spf), DEFAULT_SIEVE)
+        spf = np.zeros(size, dtype=np.int32)
+        for p in range(2, isqrt(size - 1) + 1):
+            if spf[p] == 0:
+                multiples = spf[p * p::p]
+                multiples[multiples == 0] = p  # writes through the view
+        spf[spf == 0] = np.arange(size, dtype=np.int32)[spf == 0]
+        _spf = spf
+    return _spf
+
+
+def primes_below(limit: int) -> np.ndarray:
+    """All primes p < limit"""
+    spf = smallest_prime_factors(limit)[:limit]
+    numbers = np.arange(len(spf))
+    return numbers[(spf == numbers) & (numbers >= 2)]
+
+
+def factorize(m: int) -> Dict[int, int]:
+    """Prime factorisation {p: exponent} of m >= 1"""
+    factors: Dict[int, int] = {}
+    if m < MAX_SIEVE:
+        spf = smallest_prime_factors(m + 1)
+        while m > 1:
+            p = int(spf[m])
+            factors[p] = factors.get(p, 0) + 1
+            m //= p
+        return factors
+
+    # Large m: trial division by sieve primes, then sympy for what remains
+    bound = min(isqrt(m) + 1, DEFAULT_SIEVE)
+    for p in primes_below(bound).tolist():
+        if p * p > m:
+            break
+        while m % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            m //= p
+    if m > 1:
+        if m < bound * bound:
+            factors[m] = factors.get(m, 0) + 1
+        else:
+            from sympy import factorint
+            for p, k in factorint(m).items():
+                factors[p] = factors.get(p, 0) + k
+    return factors
+
+
+def carmichael_lambda(factors: Dict[int, int]) -> int:
+    """Carmichael's lambda of the number with the given factorisation"""
+    result = 1
+    for p, k in factors.items():
+        if p == 2:
+            value = 1 if k == 1 else 2 if k == 2 else 2**(k - 2)
+        else:
+            value = (p - 1) * p**(k - 1)
+        result = result * value // gcd(result, value)
+    return result
+
+
+def multiplicative_order(a: int, m: int) -> Optional[int]:
+    """
+    Smallest k >= 1 with a^k = 1 (mod m), or None when gcd(a, m) != 1.
+    Results are memoised across calls.
+    """
+    return _multiplicative_order(a % m, m)
+
+
+@lru_cache(maxsize=ORDER_CACHE_SIZE)
+def _multiplicative_order(a: int, m: int) -> Optional[int]:
+    if gcd(a, m) != 1:
+        return None
+    if m == 1:
+        return 1
+    order = carmichael_lambda(factorize(m))
+    for q in factorize(order):
+        while order % q == 0 and pow(a, order // q, m) == 1:
+            order //= q
+    return order
+
+
+def orders_of_two(limit: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (primes, orders): ord_p(2) for every odd prime p < limit.
+    The same exponent reduction as multiplicative_order, run on whole
+    arrays: p - 1 is factored through the sieve and 2^(e/q) mod p uses
+    vectorised square-and-multiply (p < MAX_SIEVE keeps products in int64).
+    """
+    primes = primes_below(min(limit, MAX_SIEVE))
+    primes = primes[primes != 2].astype(np.int64)
+    spf = smallest_prime_factors(limit).astype(np.int64)
+    orders = primes - 1
+    remaining = primes - 1
+
+    active = np.nonzero(remaining > 1)[0]
+    while active.size:
+        q = spf[remaining[active]]
+        # Strip q from the part of p - 1 still to be factored
+        divisible = active
+        while divisible.size:
+            remaining[divisible] //= q[np.searchsorted(active, divisible)]
+            divisible = divisible[remaining[divisible] % q[np.searchsorted(active, divisible)] == 0]
+        # Divide q out of the order while 2^(order/q) = 1 (mod p)
+        reducible, factor = active, q
+        while reducible.size:
+            candidate = orders[reducible] // factor
+            ok = pow_two_mod(candidate, primes[reducible]) == 1
+            orders[reducible[ok]] = candidate[ok]
+            keep = ok & (candidate % factor == 0)
+            reducible, factor = reducible[keep], factor[keep]
+        active = active[remaining[active] > 1]
+    return primes, orders
+
+
+def pow_two_mod(exponents: np.ndarray, moduli: np.ndarray) -> np.ndarray:
+    """2^e mod m elementwise, by binary exponentiation"""
+    result = np.ones(len(exponents), dtype=np.int64) % moduli
+    base = 2 % moduli
+    e = exponents.copy()
+    while (e > 0).any():
+        odd = (e & 1).astype(bool)
+        result = np.where(odd, result * base % moduli, result)
+        base = base * base % moduli
+        e >>= 1
+    return result
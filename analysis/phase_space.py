@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Binary Phase Space
+Phase points (bit density, change in density, bit width) of trajectories
+and attractor detection in near-linear time: neighbour counts come from a
+k-d tree (scipy.spatial.cKDTree) and near-duplicate attractors are merged
+through a grid hash, instead of comparing every pair of points.
+"""
+
+import numpy as np
+from scipy.spatial import cKDTree
+from typing import Dict, List, Sequence, Tuple
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.bit_features import batch_features
+
+NEIGHBOUR_RADIUS = 0.1
+MIN_NEIGHBOUR_FRACTION = 0.1
+DUPLICATE_TOLERANCE = 0.05
+
+
+def phase_points(trajectories: Sequence[Sequence[int]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (density, change in density to the next value, bit width) for every
+    value of every trajectory except its last; points of different
+    trajectories are simply concatenated.
+    """
+    x, y, z = [], [], []
+    for features in batch_features(trajectories):
+        density = features['density']
+        x.append(density[:-1])
+        y.append(np.diff(density))
+        z.append(features['bit_length'][:-1])
+    if not x:
+        return np.zeros(0), np.zeros(0), np.zeros(0, dtype=np.int64)
+    return np.concatenate(x), np.concatenate(y), np.concatenate(z)
+
+
+def neighbour_counts(points: np.ndarray, radius: float = NEIGHBOUR_RADIUS) -> np.ndarray:
+    """Number of other points strictly closer than radius (Euclidean) to each point"""
+    if not len(points):
+        return np.zeros(0, dtype=np.int64)
+    # Densities are small-denominator fractions, so phase points repeat heavily:
+    # index each distinct point once, weighted by its multiplicity
+    distinct, inverse, weights = np.unique(points, axis=0, return_inverse=True, return_counts=True)
+    tree = cKDTree(distinct)
+    # query_ball_point includes distances equal to r, and the point itself
+    neighbours = tree.query_ball_point(distinct, np.nextafter(radius, 0))
+    counts = np.array([weights[j].sum() for j in neighbours], dtype=np.int64)
+    return counts[inverse.ravel()] - 1
+
+
+def unique_points(points: np.ndarray, tolerance: float = DUPLICATE_TOLERANCE) -> List[int]:
+    """
+    Indices of the points kept by a greedy pass in order, where a point is
+    dropped if an already kept point is within tolerance in every coordinate.
+    Repeats of a point are always dropped, so only first occurrences are
+    visited; kept points are hashed into grid cells of side tolerance, so
+    each one is only compared with the kept points of neighbouring cells.
+    """
+    if not len(points):
+        return []
+    _, first = np.unique(points, axis=0, return_index=True)
+    cells: Dict[Tuple[int, ...], List[int]] = {}
+    offsets = np.array(np.meshgrid(*[[-1, 0, 1]] * points.shape[1])).reshape(points.shape[1], -1).T
+    kept = []
+    for i in np.sort(first):
+        cell = np.floor(points[i] / tolerance).astype(np.int64)
+        duplicate = any(
+            np.all(np.abs(points[j] - points[i]) < tolerance)
+            for offset in offsets
+            for j in cells.get(tuple(cell + offset), ())
+        )
+        if not duplicate:
+            kept.append(int(i))
+            cells.setdefault(tuple(cell), []).append(i)
+    return kept
+
+
+def find_attractors(x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                    radius: float = NEIGHBOUR_RADIUS,
+                    min_fraction: float = MIN_NEIGHBOUR_FRACTION,
+                    tolerance: float = DUPLICATE_TOLERANCE) -> List[Dict]:
+    """
+    Phase points (in the density / change-rate plane) with more than
+    min_fraction of all points within radius, de-duplicated with unique_points
+    """
+    points = np.column_stack((x, y))
+    nearby = neighbour_counts(points, radius)
+    candidates = np.flatnonzero(nearby > len(points) * min_fraction)
+    return [
+        {
+            'density': float(x[i]),
+            'change_rate': float(y[i]),
+            'width': int(z[i]),
+            'strength': int(nearby[i])
+        }
+        for i in candidates[unique_points(points[candidates], tolerance)]
+    ]
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Primality Sweep over s_n
+Finds the indices n with s_n = (2^(2n+1) + 1)/3 prime: a cheap sieve
+removes most indices, Miller-Rabin tests the survivors on a process pool
+(confirmed by BPSW beyond its deterministic range), and long sweeps
+checkpoint their progress so they can resume.
+"""
+
+import json
+import os
+import sys
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.multiplicative_order import primes_below
+from analysis.shift_sequence import SHIFTS, ShiftSequence
+
+# Miller-Rabin bases; together they are deterministic below 3.3 * 10^24
+WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+# Small primes whose residues filter indices before any big-number test
+DEFAULT_SIEVE_LIMIT = 2**16
+
+# Indices sieved (and checkpointed) per pass
+DEFAULT_BATCH = 256
+
+
+def is_probable_prime(n: int) -> bool:
+    """Strong probable-prime test to the WITNESSES bases (exact below DETERMINISTIC_LIMIT)"""
+    if n < 2:
+        return False
+    for p in WITNESSES:
+        if n % p == 0:
+            return n == p
+    d, r = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        r += 1
+    for a in WITNESSES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime(n: int) -> bool:
+    """
+    Miller-Rabin to the WITNESSES bases, which is exact below
+    DETERMINISTIC_LIMIT; larger survivors are confirmed with sympy's
+    isprime (Baillie-PSW, strong Lucas step included).
+    """
+    if not is_probable_prime(n):
+        return False
+    if n < DETERMINISTIC_LIMIT:
+        return True
+    from sympy import isprime
+    return isprime(n)
+
+
+def _test_indices(indices: List[int]) -> List[int]:
+    """Worker entry point: the indices whose s_n passes is_prime"""
+    return [n for n in indices if is_prime(ShiftSequence.closed_form(n))]
+
+
+def _sieve(start: int, stop: int, primes: np.ndarray) -> List[int]:
+    """
+    Indices in [start, stop) that survive the cheap filters:
+    - 2n+1 composite makes s_n composite (it has the algebraic factor
+      Phi_2e(2) for every divisor e of 2n+1);
+    - s_n = 0 (mod p) for a small prime p < s_n.
+    Residues follow the recurrence s_{n+1} = 4 s_n - 1 (mod p).
+    """
+    s_start = SHIFTS[start]
+    residues = np.array([s_start % p for p in primes.tolist()], dtype=np.int64)
+    index_primes = set(primes_below(2 * stop + 2).tolist())
+    survivors = []
+    for n in range(start, stop):
+        if n > 0 and 2 * n + 1 in index_primes:
+            # A zero residue only proves compositeness once s_n exceeds the sieve primes
+            if SHIFTS[n] <= primes[-1] or not (residues == 0).any():
+                survivors.append(n)
+        residues = (4 * residues - 1) % primes
+    return survivors
+
+
+def sweep_prime_indices(stop: int, start: int = 0, workers: int = 1,
+                        sieve_limit: int = DEFAULT_SIEVE_LIMIT, batch_size: int = DEFAULT_BATCH,
+                        checkpoint: Optional[str] = None, verbose: bool = False) -> List[int]:
+    """
+    Indices n in [start, stop) with s_n prime according to is_prime
+    (Miller-Rabin, plus BPSW for s_n >= DETERMINISTIC_LIMIT).
+
+    With checkpoint set, the sweep state is written to that JSON file
+    after every batch and a later call with the same file resumes from
+    the last completed batch. workers > 1 (None = all cores) tests the
+    sieve survivors of each batch on a process pool.
+    """
+    state = _load_checkpoint(checkpoint, start)
+    primes = primes_below(sieve_limit).astype(np.int64)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        while state['next'] < stop:
+            lo, hi = state['next'], min(state['next'] + batch_size, stop)
+            survivors = _sieve(lo, hi, primes)
+            if executor is None:
+                found = _test_indices(survivors)
+            else:
+                shards = [survivors[i::workers] for i in range(workers)]
+                found = sorted(n for part in executor.map(_test_indices, shards) for n in part)
+            state['primes'].extend(found)
+            state['tested'] += len(survivors)
+            state['next'] = hi
+            _save_checkpoint(checkpoint, state)
+            if verbose:
+                print(f"  n < {hi}: {len(survivors)}/{hi - lo} indices tested, primes so far {state['primes']}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return [n for n in state['primes'] if n < stop]
+
+
+def _load_checkpoint(path: Optional[str], start: int) -> Dict:
+    if path and os.path.exists(path):
+        with open(path) as f:
+            state = json.load(f)
+        if state['start'] == start:
+            return state
+    return {'start': start, 'next': start, 'tested': 0, 'primes': []}
+
+
+def _save_checkpoint(path: Optional[str], state: Dict):
+    if not path:
+        return
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(state, f)
+    os.replace(temporary, path)  # never leave a half-written checkpoint
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Resonant-Pair Index
+Pairs of numbers whose (fundamental, centroid) frequency signatures are
+similar, found without comparing every pair. Similarity is
+    ((1 - |f1 - f2|) + (1 - |c1 - c2|)) / 2
+so similarity > threshold means |f1 - f2| + |c1 - c2| < 2 (1 - threshold).
+Fundamentals are FFT bin frequencies and take few distinct values, so
+numbers are grouped by fundamental and sorted by centroid within a group;
+each number is then compared only with the centroid window of the groups
+whose fundamental is close enough. Matches are streamed out in blocks.
+"""
+
+import numpy as np
+from typing import Iterator, Sequence, Tuple
+
+RESONANCE_THRESHOLD = 0.9
+DEFAULT_BLOCK = 2**20
+
+# Slack on the search windows; every candidate is re-checked with the exact formula
+_WINDOW_SLACK = 1e-9
+
+
+def similarity(f1, c1, f2, c2):
+    """Resonance similarity of two signatures (works elementwise on arrays)"""
+    freq_similarity = 1 - np.abs(f1 - f2)
+    centroid_similarity = 1 - np.abs(c1 - c2)
+    return (freq_similarity + centroid_similarity) / 2
+
+
+def resonant_pair_blocks(numbers: Sequence[int], fundamentals: Sequence[float], centroids: Sequence[float],
+                         threshold: float = RESONANCE_THRESHOLD,
+                         block: int = DEFAULT_BLOCK) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Stream (first, second, similarity) arrays, first < second, covering every
+    pair of numbers with nonzero fundamentals and similarity > threshold
+    exactly once. Each block holds at most `block` candidate comparisons
+    (or the window of a single number, if larger).
+    """
+    numbers = np.asarray(numbers, dtype=np.int64)
+    fundamentals = np.asarray(fundamentals, dtype=np.float64)
+    centroids = np.asarray(centroids, dtype=np.float64)
+    radius = 2 * (1 - threshold) + _WINDOW_SLACK
+
+    keep = fundamentals != 0
+    numbers, fundamentals, centroids = numbers[keep], fundamentals[keep], centroids[keep]
+    order = np.lexsort((centroids, fundamentals))
+    numbers, fundamentals, centroids = numbers[order], fundamentals[order], centroids[order]
+    values, group_starts = np.unique(fundamentals, return_index=True)
+    group_ends = np.append(group_starts[1:], len(fundamentals))
+
+    for a in range(len(values)):
+        a_slice = slice(group_starts[a], group_ends[a])
+        for b in range(a, len(values)):
+            gap = values[b] - values[a]
+            if gap >= radius:
+                break
+            b_start, b_end = group_starts[b], group_ends[b]
+            b_centroids = centroids[b_start:b_end]
+            window = radius - gap
+            lo = b_start + np.searchsorted(b_centroids, centroids[a_slice] - window, side='left')
+            hi = b_start + np.searchsorted(b_centroids, centroids[a_slice] + window, side='right')
+            yield from _expand(numbers, fundamentals, centroids, np.arange(a_slice.start, a_slice.stop),
+                               lo, hi, a == b, threshold, block)
+
+
+def _expand(numbers, fundamentals, centroids, rows, lo, hi, same_group, threshold, block):
+    # Candidate (row, column) comparisons for each row's window [lo, hi),
+    # materialised a block of comparisons at a time
+    counts = hi - lo
+    cumulative = np.cumsum(counts)
+    start, done = 0, 0
+    while start < len(rows):
+        stop = max(int(np.searchsorted(cumulative, done + block, side='right')), start + 1)
+        part = np.arange(start, stop)
+        start, done = stop, int(cumulative[stop - 1])
+        part_counts = counts[part]
+        if not part_counts.sum():
+            continue
+        i = np.repeat(rows[part], part_counts)
+        offsets = np.arange(len(i)) - np.repeat(np.cumsum(part_counts) - part_counts, part_counts)
+        j = np.repeat(lo[part], part_counts) + offsets
+        if same_group:
+            i, j = i[i < j], j[i < j]
+        scores = similarity(fundamentals[i], centroids[i], fundamentals[j], centroids[j])
+        match = scores > threshold
+        first, second = numbers[i[match]], numbers[j[match]]
+        yield np.minimum(first, second), np.maximum(first, second), scores[match]
+
+
+def resonant_pairs(numbers: Sequence[int], fundamentals: Sequence[float], centroids: Sequence[float],
+                   threshold: float = RESONANCE_THRESHOLD) -> Iterator[Tuple[int, int, float]]:
+    """resonant_pair_blocks one (first, second, similarity) tuple at a time"""
+    for first, second, scores in resonant_pair_blocks(numbers, fundamentals, centroids, threshold):
+        yield from zip(first.tolist(), second.tolist(), scores.tolist())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Binary Inverse (Shift) Sequence
+s_n = (2^(2n+1) + 1)/3 = 1, 3, 11, 43, 171, ... shared by every script
+"""
+
+from typing import Iterator, List, Union
+
+
+class ShiftSequence:
+    """
+    The sequence s_n = (2^(2n+1) + 1)/3.
+
+    Random access builds the bit pattern directly: s_n = 2 R_n + 1 where
+    R_n = (4^n - 1)/3 is binary 0101...01 (n ones), so no huge power is
+    divided. Consecutive terms follow s_{n+1} = 4 s_n - 1; the last term
+    is kept so ascending sweeps cost one shift per step.
+    """
+
+    def __init__(self):
+        self._last_index = 0
+        self._last_value = 1
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[int, List[int]]:
+        if isinstance(key, slice):
+            start, stop, step = key.start or 0, key.stop, key.step or 1
+            if stop is None or start < 0 or stop < 0 or step < 0:
+                raise ValueError("shift sequence slices need non-negative bounds and a stop")
+            return list(self.terms(start, stop))[::step]
+        if key < 0:
+            raise IndexError("shift sequence index must be non-negative")
+        if key == self._last_index:
+            return self._last_value
+        if key == self._last_index + 1:
+            value = (self._last_value << 2) - 1
+        else:
+            value = self.closed_form(key)
+        self._last_index, self._last_value = key, value
+        return value
+
+    def __iter__(self) -> Iterator[int]:
+        n = 0
+        while True:
+            yield from self.terms(n, n + 1024)
+            n += 1024
+
+    def __call__(self, n: int) -> int:
+        return self[n]
+
+    @staticmethod
+    def closed_form(n: int) -> int:
+        """s_n from its bit pattern 10101...011 (n >= 0)"""
+        if n == 0:
+            return 1
+        # R_n = 0b0101...01 with n ones: repeated 0x55 bytes, masked to 2n bits
+        repunit = int.from_bytes(b'\x55' * ((2 * n + 7) // 8), 'big') & ((1 << (2 * n)) - 1)
+        return (repunit << 1) | 1
+
+    def terms(self, start: int, stop: int) -> Iterator[int]:
+        """s_start, ..., s_{stop-1}, one closed form then the recurrence"""
+        if start >= stop:
+            return
+        value = self[start]
+        yield value
+        for _ in range(start + 1, stop):
+            value = (value << 2) - 1
+            yield value
+
+
+# Shared instance used by the verification scripts
+SHIFTS = ShiftSequence()
+
+
+def shift(n: int) -> int:
+    """s_n = (2^(2n+1) + 1)/3"""
+    return SHIFTS[n]
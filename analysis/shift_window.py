@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Shift-Window Sampler
+Windows of consecutive odd integers around a shift s_n, and matched
+random odd controls, handed out in bounded chunks: uint64 arrays when
+every value fits in 64 bits, lists of Python ints for bigger shifts.
+"""
+
+import numpy as np
+from typing import Iterator, List, Optional, Tuple, Union
+
+# Values per chunk yielded by the samplers
+DEFAULT_CHUNK = 2**20
+
+Chunk = Union[np.ndarray, List[int]]
+
+
+class OddWindow:
+    """
+    The odd numbers centre + 2*offset for offsets in [first_offset,
+    first_offset + count), i.e. start, start+2, ..., start+2(count-1).
+    """
+
+    def __init__(self, centre: int, first_offset: int, count: int):
+        self.centre = int(centre)
+        self.first_offset = int(first_offset)
+        self.count = max(0, int(count))
+        self.start = self.centre + 2 * self.first_offset
+
+    @classmethod
+    def around(cls, centre: int, first_offset: int, stop_offset: int) -> 'OddWindow':
+        """Offsets in [first_offset, stop_offset), clipped so every n = centre + 2*offset > 0"""
+        first = max(first_offset, -((int(centre) - 1) // 2))
+        return cls(centre, first, stop_offset - first)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def last(self) -> int:
+        return self.start + 2 * (self.count - 1)
+
+    @property
+    def fits_uint64(self) -> bool:
+        return self.count == 0 or (self.start >= 0 and self.last < 2**64)
+
+    def blocks(self, chunk: int = DEFAULT_CHUNK) -> Iterator[Tuple[int, int]]:
+        """(first value, count) of consecutive sub-windows of at most chunk values"""
+        for i in range(0, self.count, chunk):
+            yield self.start + 2 * i, min(chunk, self.count - i)
+
+    def chunks(self, chunk: int = DEFAULT_CHUNK) -> Iterator[Chunk]:
+        """The window's values, chunk at a time"""
+        wide = self.fits_uint64
+        for first, count in self.blocks(chunk):
+            if wide:
+                yield np.uint64(first) + np.arange(0, 2 * count, 2, dtype=np.uint64)
+            else:
+                yield list(range(first, first + 2 * count, 2))
+
+    def values(self) -> Chunk:
+        """The whole window at once (a single chunk)"""
+        return next(self.chunks(max(self.count, 1)), np.zeros(0, dtype=np.uint64))
+
+
+def as_ints(chunk: Chunk) -> List[int]:
+    """A chunk as a list of Python ints (safe for unbounded arithmetic)"""
+    return chunk.tolist() if isinstance(chunk, np.ndarray) else chunk
+
+
+def shift_window(shift: int, sample_size: int) -> OddWindow:
+    """The positive odd numbers shift + 2*offset for offset in [-sample_size//2, sample_size//2)"""
+    return OddWindow.around(shift, -sample_size // 2, sample_size // 2)
+
+
+def random_odd(low: int, high: int, size: int, rng: Optional[np.random.Generator] = None,
+               chunk: int = DEFAULT_CHUNK) -> Iterator[Chunk]:
+    """
+    size random odd numbers 2m + 1 with low <= m < high, chunk at a time:
+    uint64 arrays while 2*high + 1 fits, else Python ints drawn by
+    rejection sampling on random bytes.
+    """
+    rng = np.random.default_rng(rng)
+    low, high = int(low), int(high)
+    for done in range(0, size, chunk):
+        count = min(chunk, size - done)
+        if 2 * high < 2**63:
+            yield (2 * rng.integers(low, high, size=count) + 1).astype(np.uint64)
+            continue
+        span = high - low
+        nbytes = (span.bit_length() + 7) // 8
+        excess = 8 * nbytes - span.bit_length()
+        values = []
+        while len(values) < count:
+            m = int.from_bytes(rng.bytes(nbytes), 'little') >> excess
+            if m < span:
+                values.append(2 * (low + m) + 1)
+        yield values
+
+
+def matched_controls(shift: int, size: int, rng: Optional[np.random.Generator] = None,
+                     chunk: int = DEFAULT_CHUNK) -> Iterator[Chunk]:
+    """Random odd controls of the same magnitude as shift: 2m + 1 with shift//2 <= m < 2*shift"""
+    return random_odd(int(shift) // 2, 2 * int(shift), size, rng, chunk)
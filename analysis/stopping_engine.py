@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Stopping-Time Engine with Early Termination
+Exact (uncapped) total stopping times, peaks and stopping times. Every
+odd n below the stopping-time table's bound has a verified entry, so that
+bound is a watermark: a trajectory only has to be followed, by k-step
+jumps, until it drops below it, and the rest is a single table read.
+"""
+
+import numpy as np
+from typing import Sequence, Tuple
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.stopping_times import StoppingTimeTable, default_table
+from analysis.jump_table import JumpTable
+
+
+# Verified odd n at most this many odd numbers above the watermark are kept
+# until the run from the watermark is complete and can be absorbed
+PENDING_SPAN = 2**16
+
+
+class StoppingTimeEngine:
+    """
+    Stopping-time lookups that keep score of the work they do.
+
+    steps counts the Collatz steps of every answered trajectory (what a
+    step-by-step walk would cost). The work actually done is one table read
+    per sample, the k-step jumps taken above the watermark, and the steps
+    spent building the stopping-time and jump tables (build_steps, counted
+    in full). speedup = steps / (table_reads + jumps + build_steps).
+
+    Verified results just above the watermark are appended to the table once
+    they form an unbroken run of odd numbers from it, so the watermark rises
+    as the engine answers queries.
+    """
+
+    def __init__(self, table: StoppingTimeTable = None, k: int = 16):
+        self.table = table if table is not None else default_table()
+        if self.table.jump_table is None:
+            self.table.jump_table = JumpTable(k, tail_table=self.table)
+        self.samples = 0
+        self.steps = 0
+        self.jumps = 0
+        self.absorbed = 0
+        self._verified = {}
+
+    @property
+    def watermark(self) -> int:
+        """Every n below this value has a verified table entry"""
+        return self.table.bound
+
+    def raise_watermark(self, bound: int) -> int:
+        """Build table entries (up to its max_bound) for n < bound; returns the number added"""
+        added = self.table.extend(bound)
+        self._verified = {n: v for n, v in self._verified.items() if n >= self.watermark}
+        return added
+
+    def lookup(self, n: int) -> Tuple[int, int, int]:
+        """(total stopping time, peak, stopping time) of n >= 1"""
+        jumps = self.table.jump_table.jumps
+        result = self.table.lookup(n)
+        self._account(result[0], 1, jumps)
+        self._remember(_as_numbers([n]), *(np.array([value]) for value in result))
+        return result
+
+    def lookup_many(self, numbers: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """lookup() for many n at once, as StoppingTimeTable.lookup_many"""
+        numbers = _as_numbers(numbers)  # read twice below, so no one-shot iterators
+        jumps = self.table.jump_table.jumps
+        result = self.table.lookup_many(numbers)
+        self._account(int(result[0].sum()), len(result[0]), jumps)
+        self._remember(numbers, *result)
+        return result
+
+    def window(self, start: int, count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """lookup() for the odd numbers start, start+2, ..., start+2(count-1)"""
+        jumps = self.table.jump_table.jumps
+        result = self.table.window(start, count)
+        self._account(int(result[0].sum()), len(result[0]), jumps)
+        if start & 1 and start <= self.watermark + 1 < start + 2 * count:
+            # The window runs through the watermark: absorb its part above it directly
+            first = (self.watermark + 1 - start) // 2
+            self._append(*(values[first:] for values in result))
+        else:
+            self._remember(_as_numbers(range(start, start + 2 * count, 2)), *result)
+        return result
+
+    def total_stopping_time(self, n: int) -> int:
+        return self.lookup(n)[0]
+
+    def _account(self, steps: int, samples: int, jumps_before: int):
+        self.samples += samples
+        self.steps += steps
+        self.jumps += self.table.jump_table.jumps - jumps_before
+
+    def _remember(self, numbers: np.ndarray, total, peaks, stopping):
+        """Keep verified odd results just above the watermark, then absorb any complete run"""
+        low, high = self.watermark, self.watermark + 2 * PENDING_SPAN
+        keep = ((numbers & 1) == 1) & (numbers >= low) & (numbers < high)
+        if peaks.dtype == object:
+            keep &= (peaks < 2**64).astype(bool)
+        for i in np.flatnonzero(keep).tolist():
+            self._verified[int(numbers[i])] = (int(total[i]), int(peaks[i]), int(stopping[i]))
+        # The table's bound is even; its next entry is the odd number above it
+        run = []
+        n = self.watermark + 1
+        while n in self._verified:
+            run.append(self._verified.pop(n))
+            n += 2
+        if run:
+            self._append(*zip(*run))
+
+    def _append(self, total, peaks, stopping):
+        peaks = [int(p) for p in peaks]
+        # Only entries whose peak fits the table's uint64 column
+        fits = next((i for i, p in enumerate(peaks) if p >= 2**64), len(peaks))
+        self.absorbed += self.table.append(list(total)[:fits], peaks[:fits], list(stopping)[:fits])
+        self._verified = {n: v for n, v in self._verified.items() if n >= self.watermark}
+
+    @property
+    def table_reads(self) -> int:
+        """One final table read per answered sample"""
+        return self.samples
+
+    @property
+    def iterations(self) -> int:
+        """Table reads plus jumps performed for the answered samples"""
+        return self.table_reads + self.jumps
+
+    @property
+    def build_steps(self) -> int:
+        """Collatz steps spent building the stopping-time and jump tables"""
+        return self.table.build_steps + self.table.jump_table.build_steps
+
+    @property
+    def speedup(self) -> float:
+        """Collatz steps answered per unit of work, table building included"""
+        work = self.iterations + self.build_steps
+        return self.steps / work if work else 1.0
+
+    def reset_metrics(self):
+        self.samples = self.steps = self.jumps = self.absorbed = 0
+
+    def report(self) -> str:
+        return (f"{self.samples} trajectories ({self.steps} Collatz steps) answered with "
+                f"{self.table_reads} table reads and {self.jumps} jumps; tables cost "
+                f"{self.build_steps} steps to build (speedup {self.speedup:.2f}x including the build); "
+                f"watermark {self.watermark}, {self.absorbed} verified entries absorbed")
+
+
+_default_engine = None
+
+
+def default_engine() -> StoppingTimeEngine:
+    """Shared engine on top of default_table(), so all scripts raise one watermark"""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = StoppingTimeEngine(default_table())
+    return _default_engine
+
+
+def _as_numbers(numbers: Sequence[int]) -> np.ndarray:
+    """numbers as a uint64 array, or an object array if some do not fit"""
+    numbers = [int(n) for n in numbers]
+    return np.array(numbers, dtype=np.uint64 if not numbers or max(numbers) < 2**64 else object)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Stopping-Time Table
+Dense, array-backed stopping times, total stopping times and peaks for odd n,
+built bottom-up by reusing the entries of smaller numbers
+"""
+
+import numpy as np
+from typing import Sequence, Tuple
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.trajectory_engine import UINT64_SAFE_LIMIT
+
+# Where default_table() persists its entries (setup.sh creates data/)
+DEFAULT_TABLE_PATH = os.environ.get(
+    'COLLATZ_STOPPING_TABLE',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'stopping_times.npz')
+)
+
+# Odd numbers processed per vectorised build pass
+BUILD_CHUNK = 2**18
+
+
+class StoppingTimeTable:
+    """
+    Stopping-time table for odd n below `bound`.
+
+    Entry i describes n = 2i + 1:
+      total[i]    - total stopping time (steps for n to reach 1)
+      stopping[i] - stopping time (first step whose value is below n)
+      peaks[i]    - maximum value reached by the trajectory
+
+    Each odd n is only iterated until it drops to an odd value m < n; the
+    rest of its trajectory is read from entry m. Even n and n beyond the
+    bound are answered from the table after stripping factors of 2 or
+    jumping / walking down into it. The table only grows when extend() is
+    called, or on lookups beyond the bound if auto_extend is set; every
+    extension is recorded in `extensions` as (old bound, new bound).
+    """
+
+    def __init__(self, bound: int = 2**20, max_bound: int = 2**24, auto_extend: bool = False):
+        self.max_bound = max_bound
+        self.auto_extend = auto_extend
+        self.extensions = []
+        # Collatz steps spent building the entries (the cost lookups amortise)
+        self.build_steps = 0
+        self.bound = 1
+        self.total = np.zeros(0, dtype=np.uint16)
+        self.stopping = np.zeros(0, dtype=np.uint16)
+        self.peaks = np.zeros(0, dtype=np.uint64)
+        # Optional multi-step engine (analysis.jump_table.JumpTable) for n beyond the table
+        self.jump_table = None
+        self.extend(bound)
+
+    # ------------------------------------------------------------------
+    # Construction and persistence
+    # ------------------------------------------------------------------
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the entry arrays"""
+        return self.total.nbytes + self.stopping.nbytes + self.peaks.nbytes
+
+    def extend(self, bound: int) -> int:
+        """
+        Grow the table so that it covers every odd n < bound (capped at
+        max_bound). Returns the number of entries added.
+        """
+        bound = min(bound, self.max_bound)
+        if bound <= self.bound:
+            return 0
+        old_bound = self.bound
+        old_size = len(self.total)
+        size = bound // 2
+        self.total = np.concatenate([self.total, np.zeros(size - old_size, dtype=self.total.dtype)])
+        self.stopping = np.concatenate([self.stopping, np.zeros(size - old_size, dtype=self.stopping.dtype)])
+        self.peaks = np.concatenate([self.peaks, np.zeros(size - old_size, dtype=np.uint64)])
+
+        if old_size == 0:
+            self.total[0], self.stopping[0], self.peaks[0] = 0, 0, 1  # n = 1
+            old_size = 1
+
+        for lo in range(old_size, size, BUILD_CHUNK):
+            self._build_chunk(lo, min(lo + BUILD_CHUNK, size))
+        self.bound = 2 * size
+        self.extensions.append((old_bound, self.bound))
+        return size - old_size
+
+    def _build_chunk(self, lo: int, hi: int):
+        """Fill entries lo..hi-1 (odd n = 2*lo+1 .. 2*hi-1)"""
+        origin = np.arange(2 * lo + 1, 2 * hi, 2, dtype=np.uint64)
+        count = len(origin)
+        first_below = np.zeros(count, dtype=np.int64)
+        landing = np.zeros(count, dtype=np.uint64)
+        steps_to_landing = np.zeros(count, dtype=np.int64)
+        prefix_peak = origin.copy()
+
+        # Descend until the value is odd and below n, remembering the first drop
+        idx = np.arange(count)
+        cur = origin.copy()
+        peak = origin.copy()
+        steps = 0
+        while idx.size:
+            odd = (cur & 1).astype(bool)
+            if (cur[odd] > UINT64_SAFE_LIMIT).any():
+                raise OverflowError("stopping-time table bound too large for uint64 descent")
+            cur = np.where(odd, cur * 3 + 1, cur >> 1)
+            peak = np.maximum(peak, cur)
+            steps += 1
+
+            below = cur < origin[idx]
+            newly_below = below & (first_below[idx] == 0)
+            first_below[idx[newly_below]] = steps
+
+            done = below & (cur & 1).astype(bool)
+            if done.any():
+                done_idx = idx[done]
+                landing[done_idx] = cur[done]
+                steps_to_landing[done_idx] = steps
+                prefix_peak[done_idx] = peak[done]
+                keep = ~done
+                idx, cur, peak = idx[keep], cur[keep], peak[keep]
+
+        self.build_steps += int(steps_to_landing.sum())
+
+        # Resolve tails from smaller entries; entries inside this chunk may
+        # depend on each other, so fill in passes from the bottom up
+        target = (landing >> 1).astype(np.int64)
+        pending = np.ones(count, dtype=bool)
+        while pending.any():
+            ready = pending & ((target < lo) | ~pending[np.clip(target - lo, 0, count - 1)])
+            ready_idx = np.nonzero(ready)[0]
+            tail = target[ready_idx]
+            # Entries resolved in this pass become visible to the next one
+            self._store(lo + ready_idx,
+                        steps_to_landing[ready_idx] + self.total[tail].astype(np.int64),
+                        first_below[ready_idx],
+                        np.maximum(prefix_peak[ready_idx], self.peaks[tail]))
+            pending[ready_idx] = False
+
+    def _store(self, positions: np.ndarray, total: np.ndarray, stopping: np.ndarray, peaks: np.ndarray):
+        """Write entries, widening the step arrays to uint32 when needed"""
+        if total.size and total.max() > np.iinfo(self.total.dtype).max:
+            self.total = self.total.astype(np.uint32)
+        if stopping.size and stopping.max() > np.iinfo(self.stopping.dtype).max:
+            self.stopping = self.stopping.astype(np.uint32)
+        self.total[positions] = total
+        self.stopping[positions] = stopping
+        self.peaks[positions] = peaks
+
+    def append(self, total: Sequence[int], peaks: Sequence[int], stopping: Sequence[int]) -> int:
+        """
+        Add already verified entries for the odd numbers bound + 1, bound + 3, ...
+        (peaks must fit in uint64), raising the bound without rebuilding them.
+        Entries beyond max_bound are ignored; returns the number added.
+        """
+        count = max(0, min(len(total), (self.max_bound - self.bound) // 2))
+        if count == 0:
+            return 0
+        old_bound, old_size = self.bound, len(self.total)
+        self.total = np.concatenate([self.total, np.zeros(count, dtype=self.total.dtype)])
+        self.stopping = np.concatenate([self.stopping, np.zeros(count, dtype=self.stopping.dtype)])
+        self.peaks = np.concatenate([self.peaks, np.zeros(count, dtype=np.uint64)])
+        self._store(np.arange(old_size, old_size + count),
+                    np.asarray(total[:count], dtype=np.int64),
+                    np.asarray(stopping[:count], dtype=np.int64),
+                    np.asarray(peaks[:count], dtype=np.uint64))
+        self.bound += 2 * count
+        self.extensions.append((old_bound, self.bound))
+        return count
+
+    def save(self, path: str):
+        """Persist the table as a compressed .npz archive"""
+        np.savez_compressed(path, total=self.total, stopping=self.stopping,
+                            peaks=self.peaks, max_bound=self.max_bound, build_steps=self.build_steps)
+
+    @classmethod
+    def load(cls, path: str) -> 'StoppingTimeTable':
+        """Load a table written by save()"""
+        data = np.load(path)
+        table = cls(bound=1, max_bound=int(data['max_bound']))
+        table.total = data['total']
+        table.stopping = data['stopping']
+        table.peaks = data['peaks']
+        table.bound = 2 * len(table.total)
+        table.build_steps = int(data['build_steps']) if 'build_steps' in data.files else 0
+        return table
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def lookup(self, n: int) -> Tuple[int, int, int]:
+        """(total stopping time, peak, stopping time) of a single n >= 1"""
+        self._auto_extend(n)
+        if n < self.bound:
+            if n & 1:
+                i = n >> 1
+                return int(self.total[i]), int(self.peaks[i]), int(self.stopping[i])
+            zeros = (n & -n).bit_length() - 1
+            i = (n >> zeros) >> 1
+            return zeros + int(self.total[i]), max(n, int(self.peaks[i])), 1
+
+        # Beyond the table: jump or walk down into it
+        if self.jump_table is not None:
+            return self.jump_table.summary(n)
+        current, steps, peak, stopping = n, 0, n, 0
+        while current >= self.bound or not current & 1:
+            current = 3 * current + 1 if current & 1 else current >> 1
+            peak = max(peak, current)
+            steps += 1
+            if not stopping and current < n:
+                stopping = steps
+        i = current >> 1
+        return steps + int(self.total[i]), max(peak, int(self.peaks[i])), stopping
+
+    def lookup_many(self, numbers: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorised lookup for many n >= 1.
+        Returns (total stopping times, peaks, stopping times) arrays; peaks
+        has dtype object only if some peak does not fit in uint64.
+        """
+        numbers = [int(x) for x in numbers]
+        if not numbers:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, np.zeros(0, dtype=np.uint64), empty
+        self._auto_extend(max(numbers))
+
+        inside = np.array([x < self.bound for x in numbers])
+        values = np.array([x if x < self.bound else 1 for x in numbers], dtype=np.uint64)
+        zeros = _trailing_zeros(values)
+        odd_idx = ((values >> zeros.astype(np.uint64)) >> np.uint64(1)).astype(np.int64)
+
+        total = zeros + self.total[odd_idx].astype(np.int64)
+        peaks = np.maximum(values, self.peaks[odd_idx])
+        stopping = np.where(zeros > 0, 1, self.stopping[odd_idx].astype(np.int64))
+
+        if not inside.all():
+            peaks = peaks.astype(object)
+            for i in np.nonzero(~inside)[0]:
+                total[i], peaks[i], stopping[i] = self.lookup(numbers[i])
+            if max(peaks) <= np.iinfo(np.uint64).max:
+                peaks = peaks.astype(np.uint64)
+        return total, peaks, stopping
+
+    def window(self, start: int, count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Lookups for the odd numbers start, start+2, ..., start+2(count-1).
+        Inside the table this is a slice per array rather than count lookups.
+        """
+        if start & 1 and start > 0:
+            last = start + 2 * (count - 1)
+            self._auto_extend(last)
+            if last < self.bound:
+                i = start >> 1
+                return (self.total[i:i + count].astype(np.int64),
+                        self.peaks[i:i + count].copy(),
+                        self.stopping[i:i + count].astype(np.int64))
+        return self.lookup_many(range(start, start + 2 * count, 2))
+
+    def _auto_extend(self, n: int):
+        if self.auto_extend and n >= self.bound:
+            self.extend(_next_power_of_two(n + 1))
+
+
+def _next_power_of_two(n: int) -> int:
+    return 1 << (n - 1).bit_length()
+
+
+def _trailing_zeros(values: np.ndarray) -> np.ndarray:
+    """Trailing zero count of each (non-zero) uint64 value"""
+    zeros = np.zeros(len(values), dtype=np.int64)
+    rest = values.copy()
+    even = (rest & 1) == 0
+    while even.any():
+        zeros += even
+        rest = np.where(even, rest >> 1, rest)
+        even = (rest & 1) == 0
+    return zeros
+
+
+_default_table = None
+
+
+def default_table() -> StoppingTimeTable:
+    """
+    Shared table used by the verification scripts, with a 16-bit jump
+    table for numbers beyond its bound. Loaded from DEFAULT_TABLE_PATH
+    when present; persist_default_table saves it there after it is built
+    or extended, provided the data/ directory exists.
+    """
+    global _default_table
+    if _default_table is None:
+        if os.path.exists(DEFAULT_TABLE_PATH):
+            _default_table = StoppingTimeTable.load(DEFAULT_TABLE_PATH)
+            _default_table._saved_bound = _default_table.bound
+        else:
+            _default_table = StoppingTimeTable()
+            _default_table._saved_bound = 0  # nothing on disk yet
+        from analysis.jump_table import JumpTable
+        _default_table.jump_table = JumpTable(16, tail_table=_default_table)
+    return _default_table
+
+
+def persist_default_table():
+    """Write the shared table to disk if it was built or grew since it was loaded"""
+    table = _default_table
+    if table is None or table.bound <= table._saved_bound:
+        return
+    if os.path.isdir(os.path.dirname(DEFAULT_TABLE_PATH)):
+        table.save(DEFAULT_TABLE_PATH)
+        table._saved_bound = table.bound
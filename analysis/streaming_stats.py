@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Streaming Statistics for Shift-vs-Control Tests
+Mergeable running moments (Welford / Chan) and fixed-bin histograms, so
+t-tests and variance F-tests run from summary statistics without keeping
+the samples.
+"""
+
+import math
+import numpy as np
+from scipy import stats
+from typing import Sequence, Tuple
+
+# Fixed bins for log(max value): width LOG_BIN_WIDTH on [0, LOG_RANGE);
+# larger values fall into the last bin
+LOG_BIN_WIDTH = 0.25
+LOG_RANGE = 256.0
+
+
+class RunningMoments:
+    """
+    Count, mean and sum of squared deviations (M2) of a stream of values.
+
+    Each chunk is summarised with NumPy and folded in with the pairwise
+    update of Chan et al., which is Welford's update for a chunk of one;
+    accumulators from separate workers combine the same way.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values: Sequence[float]) -> 'RunningMoments':
+        """Fold in a chunk of values"""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values):
+            chunk = RunningMoments()
+            chunk.count = len(values)
+            chunk.mean = float(values.mean())
+            chunk.m2 = float(((values - chunk.mean) ** 2).sum())
+            self.merge(chunk)
+        return self
+
+    def merge(self, other: 'RunningMoments') -> 'RunningMoments':
+        """Fold in the moments of another accumulator"""
+        count = self.count + other.count
+        if other.count:
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / count
+            self.m2 += other.m2 + delta * delta * self.count * other.count / count
+            self.count = count
+        return self
+
+    def variance(self, ddof: int = 0) -> float:
+        """Population variance (ddof=0, as np.var) or sample variance (ddof=1)"""
+        return self.m2 / (self.count - ddof) if self.count > ddof else float('nan')
+
+    def std(self, ddof: int = 0) -> float:
+        return math.sqrt(self.variance(ddof))
+
+
+class LogHistogram:
+    """Counts of log(value) in fixed bins, plus the running moments of log(value)"""
+
+    def __init__(self, bin_width: float = LOG_BIN_WIDTH, log_range: float = LOG_RANGE):
+        self.edges = np.arange(0.0, log_range + bin_width, bin_width)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+        self.moments = RunningMoments()
+
+    def update(self, values: np.ndarray) -> 'LogHistogram':
+        """Fold in a chunk of positive values (uint64 or, for huge values, object)"""
+        logs = log_values(values)
+        bins = np.clip(np.searchsorted(self.edges, logs, side='right') - 1, 0, len(self.counts) - 1)
+        self.counts += np.bincount(bins, minlength=len(self.counts))
+        self.moments.update(logs)
+        return self
+
+    def merge(self, other: 'LogHistogram') -> 'LogHistogram':
+        self.counts += other.counts
+        self.moments.merge(other.moments)
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile of log(value): upper edge of the bin reaching q"""
+        if not self.moments.count:
+            return float('nan')
+        cumulative = np.cumsum(self.counts)
+        return float(self.edges[1 + np.searchsorted(cumulative, q * cumulative[-1])])
+
+
+class GroupStatistics:
+    """Streaming summary of one sample group: trajectory lengths, log max values, stopping times"""
+
+    def __init__(self):
+        self.trajectories = RunningMoments()
+        self.max_values = LogHistogram()
+        self.stopping_times = RunningMoments()
+
+    def update(self, steps: np.ndarray, max_values: np.ndarray, stopping_times: np.ndarray) -> 'GroupStatistics':
+        self.trajectories.update(steps)
+        self.max_values.update(max_values)
+        self.stopping_times.update(stopping_times)
+        return self
+
+    def merge(self, other: 'GroupStatistics') -> 'GroupStatistics':
+        self.trajectories.merge(other.trajectories)
+        self.max_values.merge(other.max_values)
+        self.stopping_times.merge(other.stopping_times)
+        return self
+
+
+def log_values(values: np.ndarray) -> np.ndarray:
+    """Natural log of positive values, exact for Python ints beyond float range"""
+    values = np.asarray(values)
+    if values.dtype == object:
+        return np.array([math.log(v) for v in values], dtype=np.float64)
+    return np.log(values.astype(np.float64))
+
+
+def welch_ttest(a: RunningMoments, b: RunningMoments) -> Tuple[float, float]:
+    """(t, two-sided p) of Welch's unequal-variance t-test from moments alone"""
+    return tuple(float(x) for x in stats.ttest_ind_from_stats(
+        a.mean, a.std(ddof=1), a.count, b.mean, b.std(ddof=1), b.count, equal_var=False
+    ))
+
+
+def variance_ftest(a: RunningMoments, b: RunningMoments) -> Tuple[float, float]:
+    """(var_a / var_b, one-sided p that var_a is larger) from moments alone"""
+    control_var = b.variance()
+    f_stat = a.variance() / control_var if control_var > 0 else float('inf')
+    return f_stat, float(stats.f.sf(f_stat, a.count - 1, b.count - 1))
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Batched Theorem Verification Harness
+Checks the s_n theorems of the paper over large ranges of n: each theorem
+is checked batch by batch (concurrently on a process pool), stops at its
+first counterexample and reports wall time and values per second.
+
+Every check costs O(bits of s_n) per term, so n = 10^5 is reachable:
+big divisions are replaced by the exact identity 3 s_n = 2^(2n+1) + 1.
+"""
+
+import os
+import sys
+import time
+import numpy as np
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from itertools import zip_longest
+from typing import Callable, Dict, Iterable, Optional
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.multiplicative_order import orders_of_two, pow_two_mod
+from analysis.shift_sequence import ShiftSequence
+
+# Terms per task handed to a worker
+DEFAULT_BATCH = 2000
+
+# Theorem 3.1 is checked against every odd prime p != 3 below this bound
+# (also the default of comprehensive_verification's verify_theorem_3_1)
+THEOREM_3_1_PRIME_LIMIT = 10**7
+
+
+def _counterexample(theorem: str, n: int, claim: str, **values) -> Dict:
+    return {'theorem': theorem, 'n': n, 'claim': claim, **values}
+
+
+def check_theorem_2_2(start: int, stop: int) -> Optional[Dict]:
+    """Closed form, recurrence and inverse of 3 modulo 2^(2n+1) agree"""
+    previous = ShiftSequence.closed_form(start - 1) if start > 0 else None
+    for n in range(start, stop):
+        s_n = ShiftSequence.closed_form(n)
+        recurrence = 1 if n == 0 else 4 * previous - 1
+        if s_n != recurrence:
+            return _counterexample('2.2', n, "s_n = 4 s_{n-1} - 1")
+        # The inverse of 3 below 2^(2n+1) is unique, so this is s_n == pow(3, -1, 2^(2n+1))
+        if n > 0 and not (s_n >> (2 * n + 1) == 0 and (3 * s_n) & ((1 << (2 * n + 1)) - 1) == 1):
+            return _counterexample('2.2', n, "s_n = 3^(-1) mod 2^(2n+1)")
+        previous = s_n
+    return None
+
+
+def check_theorem_2_3(start: int, stop: int) -> Optional[Dict]:
+    """s_n - s_{n-1} = 3 s_{n-1} - 1 has 2-adic valuation 2n - 1"""
+    start = max(start, 1)
+    previous = ShiftSequence.closed_form(start - 1)
+    for n in range(start, stop):
+        s_n = ShiftSequence.closed_form(n)
+        diff = s_n - previous
+        if diff != 3 * previous - 1:
+            return _counterexample('2.3', n, "s_n - s_{n-1} = 3 s_{n-1} - 1")
+        valuation = (diff & -diff).bit_length() - 1
+        if valuation != 2 * n - 1:
+            return _counterexample('2.3', n, "v_2(s_n - s_{n-1}) = 2n - 1", valuation=valuation)
+        previous = s_n
+    return None
+
+
+def check_theorem_2_4(start: int, stop: int) -> Optional[Dict]:
+    """
+    s_n = 3 (mod 8) for n >= 2 and s_n | 2^(4n+2) - 1. The division is
+    certified by 3 s_n = 2^(2n+1) + 1, since 2^(4n+2) - 1 = (2^(2n+1) + 1)(2^(2n+1) - 1).
+    """
+    for n in range(max(start, 1), stop):
+        s_n = ShiftSequence.closed_form(n)
+        if n >= 2 and s_n & 7 != 3:
+            return _counterexample('2.4', n, "s_n = 3 (mod 8)", residue=s_n & 7)
+        if 3 * s_n != (1 << (2 * n + 1)) + 1:
+            return _counterexample('2.4', n, "s_n | 2^(4n+2) - 1")
+    return None
+
+
+def check_theorem_2_5(start: int, stop: int) -> Optional[Dict]:
+    """s_n lifts s_{n-1}: 3 s_n = 1 (mod 2^(2n+1)) and s_n = s_{n-1} (mod 2^(2n-1))"""
+    start = max(start, 1)
+    previous = ShiftSequence.closed_form(start - 1)
+    for n in range(start, stop):
+        s_n = ShiftSequence.closed_form(n)
+        if (3 * s_n) & ((1 << (2 * n + 1)) - 1) != 1:
+            return _counterexample('2.5', n, "3 s_n = 1 (mod 2^(2n+1))")
+        # Hensel lifting starts from 3 * 3 = 1 (mod 4)
+        solution, modulus = (3, 4) if n == 1 else (previous, 1 << (2 * n - 1))
+        if s_n & (modulus - 1) != solution:
+            return _counterexample('2.5', n, "s_n = s_{n-1} (mod 2^(2n-1))")
+        previous = s_n
+    return None
+
+
+@lru_cache(maxsize=1)
+def _theorem_3_1_orders():
+    # Computed once per process, not once per batch
+    primes, orders = orders_of_two(THEOREM_3_1_PRIME_LIMIT)
+    return primes[primes != 3], orders[primes != 3]
+
+
+def check_theorem_3_1(start: int, stop: int) -> Optional[Dict]:
+    """p | s_n iff ord_p(2) | 4n but not 2n, for odd primes p != 3 below THEOREM_3_1_PRIME_LIMIT"""
+    primes, orders = _theorem_3_1_orders()
+    start = max(start, 1)
+    # 2^(2n+1) mod p, stepped by a factor 4 per term; p | s_n iff it is -1
+    residues = pow_two_mod(np.full(len(primes), 2 * start + 1), primes)
+    for n in range(start, stop):
+        divides = (residues + 1) % primes == 0
+        condition = (4 * n % orders == 0) & (2 * n % orders != 0)
+        mismatch = np.nonzero(divides != condition)[0]
+        if mismatch.size:
+            i = mismatch[0]
+            return _counterexample('3.1', n, "p | s_n iff ord_p(2) | 4n and ord_p(2) does not divide 2n",
+                                   p=int(primes[i]), order=int(orders[i]), divides=bool(divides[i]))
+        residues = residues * 4 % primes
+    return None
+
+
+def check_theorem_4_1(start: int, stop: int) -> Optional[Dict]:
+    """s_n is written 22...23 in base 4 ((n-1) twos, then a 3)"""
+    for n in range(max(start, 1), stop):
+        s_n = ShiftSequence.closed_form(n)
+        # Low and high bit of every base-4 digit: a 2 is (0, 1), the final 3 is (1, 1)
+        low_bits = int.from_bytes(b'\x55' * ((2 * n + 7) // 8), 'big') & ((1 << (2 * n)) - 1)
+        if s_n >> (2 * n) or s_n & low_bits != 1 or s_n & (low_bits << 1) != low_bits << 1:
+            return _counterexample('4.1', n, "base-4 digits of s_n are 2^(n-1) 3")
+    return None
+
+
+THEOREMS: Dict[str, Callable[[int, int], Optional[Dict]]] = {
+    '2.2': check_theorem_2_2,
+    '2.3': check_theorem_2_3,
+    '2.4': check_theorem_2_4,
+    '2.5': check_theorem_2_5,
+    '3.1': check_theorem_3_1,
+    '4.1': check_theorem_4_1,
+}
+
+# First n each theorem makes a claim about
+FIRST_N = {'2.2': 0, '2.3': 1, '2.4': 1, '2.5': 1, '3.1': 1, '4.1': 1}
+
+
+def _run_batch(task):
+    """Worker entry point: check one theorem on [start, stop) and time it"""
+    name, start, stop = task
+    began = time.perf_counter()
+    counterexample = THEOREMS[name](start, stop)
+    return counterexample, time.perf_counter() - began
+
+
+def verify_theorems(names: Optional[Iterable[str]] = None, max_n: int = 10**5,
+                    batch_size: int = DEFAULT_BATCH, workers: int = 1,
+                    time_budget: Optional[float] = None) -> Dict[str, Dict]:
+    """
+    Check each theorem for FIRST_N[name] <= n <= max_n in batches of
+    batch_size terms.
+
+    Batches of all theorems share a process pool (workers > 1, None = all
+    cores). A theorem stops at its first counterexample; once time_budget
+    seconds have passed no new batches start. The report per theorem has:
+        verified_to: largest n up to which every term passed (FIRST_N - 1 if none)
+        values, seconds, values_per_second: terms actually checked and check time
+        counterexample: None or a dict naming n and the failing claim
+        complete: whether the whole range was decided
+    """
+    names = list(names) if names is not None else list(THEOREMS)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+
+    reports = {name: {'verified_to': FIRST_N[name] - 1, 'values': 0, 'seconds': 0.0, 'values_per_second': 0.0,
+                      'counterexample': None, 'complete': False} for name in names}
+    # Interleave theorems batch by batch so a time budget is shared between them
+    batches = [[(name, lo, min(lo + batch_size, max_n + 1)) for lo in range(FIRST_N[name], max_n + 1, batch_size)]
+               for name in names]
+    tasks = [task for round_ in zip_longest(*batches) for task in round_ if task is not None]
+
+    def record(task, result):
+        name, lo, hi = task
+        report = reports[name]
+        if report['counterexample'] is not None or report['verified_to'] != lo - 1:
+            return  # an earlier batch failed or was never run
+        counterexample, seconds = result
+        report['seconds'] += seconds
+        report['counterexample'] = counterexample
+        report['verified_to'] = hi - 1 if counterexample is None else counterexample['n'] - 1
+        report['values'] += report['verified_to'] - lo + 1 + (counterexample is not None)
+
+    def wanted(task):
+        return reports[task[0]]['counterexample'] is None and (deadline is None or time.perf_counter() < deadline)
+
+    if workers <= 1:
+        for task in tasks:
+            if wanted(task):
+                record(task, _run_batch(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = []
+            for task in tasks:
+                # Keep a few batches per worker in flight, consumed in order
+                while len(pending) >= 2 * workers:
+                    done, future = pending.pop(0)
+                    record(done, future.result())
+                if wanted(task):
+                    pending.append((task, executor.submit(_run_batch, task)))
+            for done, future in pending:
+                record(done, future.result())
+
+    for report in reports.values():
+        report['complete'] = report['counterexample'] is not None or report['verified_to'] >= max_n
+        if report['seconds'] > 0:
+            report['values_per_second'] = report['values'] / report['seconds']
+    return reports
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Bounded Trajectory Cache
+Stores Collatz trajectories as shared suffix segments under a byte budget
+"""
+
+import sys
+from collections import OrderedDict
+from itertools import count
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.trajectory_engine import get_trajectory, batch_trajectories, stop_array
+
+# Approximate cost of indexing one cached value (dict slot plus the
+# (segment, position) tuple it points to)
+ENTRY_OVERHEAD_BYTES = 100
+
+# Seeds per lockstep batch in prefetch
+PREFETCH_CHUNK = 8192
+
+
+class TrajectoryCache:
+    """
+    Trajectory cache with suffix sharing and LRU eviction.
+
+    Trajectories are stored as segments: tuples of values computed together,
+    ending at the first value that was already cached (or at 1). Every value
+    is indexed once, as value -> (segment, position), so a trajectory is read
+    back by splicing in segment slices and jumping from each segment's last
+    value to the segment holding it; two seeds that merge share every segment
+    after the merge point. When the accounted size exceeds max_bytes the
+    least recently used segments are evicted; a broken chain is simply
+    recomputed from the missing value.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20):
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._segments = OrderedDict()
+        self._index = {}
+        self._ids = count()
+
+    def __contains__(self, n: int) -> bool:
+        return n == 1 or n in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def trajectory(self, n: int, max_steps: Optional[int] = None) -> List[int]:
+        """
+        Trajectory of n (at most max_steps values), filling in missing links.
+        Counts a hit when every link was already cached, a miss otherwise.
+        """
+        limit = max_steps if max_steps is not None else float('inf')
+        trajectory = [n]
+        current = n
+        computed = False
+        while current != 1 and len(trajectory) < limit:
+            entry = self._index.get(current)
+            if entry is None:
+                # Compute only up to the first value the cache already holds
+                piece = get_trajectory(current, limit - len(trajectory) + 1, stop=self._index)
+                self.put(piece)
+                computed = True
+                piece = piece[1:]
+            else:
+                segment_id, position = entry
+                self._segments.move_to_end(segment_id)
+                segment = self._segments[segment_id]
+                end = len(segment) if max_steps is None else position + 1 + max_steps - len(trajectory)
+                piece = segment[position + 1:end]
+            trajectory.extend(piece)
+            current = trajectory[-1]
+
+        if computed:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return trajectory
+
+    def put(self, trajectory: List[int]):
+        """
+        Record an already computed (possibly truncated) trajectory, up to its
+        first value that is already cached
+        """
+        for end, value in enumerate(trajectory):
+            if value in self:
+                break
+        else:
+            end = len(trajectory) - 1
+        if end == 0:
+            if trajectory and trajectory[0] in self._index:
+                self._segments.move_to_end(self._index[trajectory[0]][0])
+            return
+
+        # Values before `end` are new; the value at `end` links onward
+        segment = tuple(trajectory[:end + 1])
+        segment_id = next(self._ids)
+        self._segments[segment_id] = segment
+        for position, value in enumerate(segment[:end]):
+            self._index[value] = (segment_id, position)
+        self.bytes_used += self._segment_bytes(segment)
+        while self.bytes_used > self.max_bytes and self._segments:
+            self._evict()
+
+    def prefetch(self, numbers: Iterable[int], max_steps: Optional[int] = None):
+        """
+        Compute the uncached seeds among numbers in one lockstep batch, each
+        stopping at its first already cached value
+        """
+        missing = [n for n in dict.fromkeys(numbers) if n not in self]
+        # In chunks, so later seeds also stop on values cached by earlier chunks.
+        # The index is sorted once; each chunk's new values are merged in, and
+        # it is only re-sorted if an eviction removed values from it.
+        sorted_index, evictions = None, None
+        for offset in range(0, len(missing), PREFETCH_CHUNK):
+            chunk = [n for n in missing[offset:offset + PREFETCH_CHUNK] if n not in self]
+            if evictions != self.evictions:
+                sorted_index, evictions = stop_array(self._index), self.evictions
+            trajectories = batch_trajectories(chunk, max_steps, stop=self._index, sorted_stop=sorted_index)
+            for trajectory in trajectories:
+                self.put(trajectory)
+            # Every value but the last of each trajectory is now indexed
+            sorted_index = _merge_sorted(sorted_index, [v for t in trajectories for v in t[:-1] if v < 2**64])
+
+    def clear(self):
+        self._segments.clear()
+        self._index.clear()
+        self.bytes_used = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters and current memory accounting"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._index),
+            'segments': len(self._segments),
+            'bytes_used': self.bytes_used,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    @staticmethod
+    def _segment_bytes(segment: tuple) -> int:
+        # The tuple, every value object it holds, and one index entry per new value
+        return (sys.getsizeof(segment) + sum(sys.getsizeof(v) for v in segment)
+                + ENTRY_OVERHEAD_BYTES * (len(segment) - 1))
+
+    def _evict(self):
+        segment_id, segment = self._segments.popitem(last=False)
+        for value in segment[:-1]:
+            if self._index.get(value, (None,))[0] == segment_id:
+                del self._index[value]
+        self.bytes_used -= self._segment_bytes(segment)
+        self.evictions += 1
+
+
+def _merge_sorted(values: np.ndarray, new: List[int]) -> np.ndarray:
+    """Sorted uint64 array values with the entries of new not yet in it inserted"""
+    new = np.unique(np.array(new, dtype=np.uint64))
+    pos = np.searchsorted(values, new)
+    present = np.zeros(len(new), dtype=bool)
+    inside = pos < len(values)
+    present[inside] = values[pos[inside]] == new[inside]
+    return np.insert(values, pos[~present], new[~present])
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Shared Collatz Trajectory Engine
+Single trajectories in pure Python and batches of starting values advanced
+in lockstep as a NumPy uint64 array (masked 3n+1 / n >> 1 per step)
+"""
+
+import numpy as np
+from typing import Container, List, Optional, Sequence, Tuple
+
+# Largest value whose 3n+1 still fits in an unsigned 64-bit word.
+# Odd values above this escape from the array to Python ints.
+UINT64_SAFE_LIMIT = (2**64 - 2) // 3
+
+
+def collatz_step(n: int) -> int:
+    """Single Collatz step with binary insight"""
+    return 3 * n + 1 if n & 1 else n >> 1  # Last bit decides, right shift halves
+
+
+def get_trajectory(n: int, max_steps: Optional[int] = None,
+                   stop: Optional[Container[int]] = None) -> List[int]:
+    """
+    Generate the Collatz trajectory of n down to 1.
+    If max_steps is given the trajectory holds at most max_steps values.
+    If stop is given the trajectory also ends at the first value after n
+    that is in stop (e.g. the nodes of a cache that already knows the rest).
+    """
+    trajectory = [n]
+    current = n
+    limit = max_steps if max_steps is not None else float('inf')
+    while current != 1 and len(trajectory) < limit:
+        current = 3 * current + 1 if current & 1 else current >> 1
+        trajectory.append(current)
+        if stop is not None and current in stop:
+            break
+    return trajectory
+
+
+def _split_starts(starts: Sequence[int]) -> Tuple[List[int], np.ndarray, np.ndarray]:
+    """Split starting values into array-resident seeds and Python-only seeds"""
+    starts = [int(s) for s in starts]
+    in_array = [i for i, s in enumerate(starts) if 0 < s <= UINT64_SAFE_LIMIT]
+    idx = np.array(in_array, dtype=np.int64)
+    values = np.array([starts[i] for i in in_array], dtype=np.uint64)
+    return starts, idx, values
+
+
+def stop_array(stop: Optional[Container[int]]) -> Optional[np.ndarray]:
+    """Sorted uint64 array of the values in stop that fit in the lockstep array"""
+    if stop is None:
+        return None
+    return np.sort(np.fromiter((v for v in stop if 0 < v < 2**64), dtype=np.uint64))
+
+
+def _lockstep(idx: np.ndarray, values: np.ndarray, limit: float, on_step, on_escape,
+              stop: Optional[np.ndarray] = None):
+    """
+    Advance every seed in lockstep until it reaches 1 or holds `limit` values.
+
+    on_step(idx, values) is called with the surviving seeds after each step;
+    on_escape(idx, values, length) receives seeds whose next 3n+1 would
+    overflow 64 bits, together with the trajectory length reached so far.
+    Seeds whose new value is in the sorted array stop are retired after
+    that step has been reported.
+    """
+    length = 1
+    while idx.size and length < limit:
+        live = values != 1
+        if not live.all():
+            idx, values = idx[live], values[live]
+            if not idx.size:
+                break
+
+        odd = (values & 1).astype(bool)
+        escape = odd & (values > UINT64_SAFE_LIMIT)
+        if escape.any():
+            on_escape(idx[escape], values[escape], length)
+            keep = ~escape
+            idx, values, odd = idx[keep], values[keep], odd[keep]
+            if not idx.size:
+                break
+
+        values = np.where(odd, values * 3 + 1, values >> 1)
+        length += 1
+        on_step(idx, values)
+
+        if stop is not None and stop.size:
+            pos = np.minimum(np.searchsorted(stop, values), stop.size - 1)
+            keep = stop[pos] != values
+            if not keep.all():
+                idx, values = idx[keep], values[keep]
+
+
+def batch_trajectories(starts: Sequence[int], max_steps: Optional[int] = None,
+                       stop: Optional[Container[int]] = None,
+                       sorted_stop: Optional[np.ndarray] = None) -> List[List[int]]:
+    """
+    Generate trajectories for many starting values at once.
+    Equivalent to [get_trajectory(n, max_steps, stop) for n in starts].
+    sorted_stop is stop_array(stop), for callers that keep it between batches.
+    """
+    starts, idx, values = _split_starts(starts)
+    limit = max_steps if max_steps is not None else float('inf')
+    trajectories = [[s] for s in starts]
+
+    columns = []
+    escaped = []
+
+    def on_step(step_idx, step_values):
+        columns.append((step_idx, step_values))
+
+    def on_escape(esc_idx, esc_values, length):
+        for i, v in zip(esc_idx.tolist(), esc_values.tolist()):
+            escaped.append((i, v, length))
+
+    if sorted_stop is None:
+        sorted_stop = stop_array(stop)
+    _lockstep(idx, values, limit, on_step, on_escape, sorted_stop)
+
+    for step_idx, step_values in columns:
+        for i, v in zip(step_idx.tolist(), step_values.tolist()):
+            trajectories[i].append(v)
+
+    # Seeds that left the array (or never fit in it) finish in Python
+    for i, v, length in escaped:
+        tail_limit = limit - length + 1
+        trajectories[i].extend(get_trajectory(v, tail_limit, stop)[1:])
+    for i, s in enumerate(starts):
+        if not 0 < s <= UINT64_SAFE_LIMIT:
+            trajectories[i] = get_trajectory(s, max_steps, stop)
+
+    return trajectories
+
+
+def batch_statistics(starts: Sequence[int], max_steps: Optional[int] = None) -> Tuple[np.ndarray, List[int]]:
+    """
+    Trajectory lengths and maximum values for many starting values,
+    without materialising the trajectories.
+
+    Returns (lengths, peaks): lengths[i] == len(get_trajectory(starts[i], max_steps))
+    and peaks[i] == max(get_trajectory(starts[i], max_steps)).
+    """
+    starts, idx, values = _split_starts(starts)
+    limit = max_steps if max_steps is not None else float('inf')
+
+    lengths = np.ones(len(starts), dtype=np.int64)
+    peaks = np.zeros(len(starts), dtype=np.uint64)
+    peaks[idx] = values
+    escaped = []
+
+    def on_step(step_idx, step_values):
+        lengths[step_idx] += 1
+        peaks[step_idx] = np.maximum(peaks[step_idx], step_values)
+
+    def on_escape(esc_idx, esc_values, length):
+        for i, v in zip(esc_idx.tolist(), esc_values.tolist()):
+            escaped.append((i, v, length))
+
+    _lockstep(idx, values, limit, on_step, on_escape)
+
+    peak_list = peaks.tolist()
+    for i, v, length in escaped:
+        tail = get_trajectory(v, limit - length + 1)
+        lengths[i] += len(tail) - 1
+        peak_list[i] = max(peak_list[i], max(tail))
+    for i, s in enumerate(starts):
+        if not 0 < s <= UINT64_SAFE_LIMIT:
+            trajectory = get_trajectory(s, max_steps)
+            lengths[i] = len(trajectory)
+            peak_list[i] = max(trajectory)
+
+    return lengths, peak_list
@@ -13,6 +13,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from analysis.binary_analyzer import CollatzBinaryAnalyzer
+from analysis.bit_planes import bit_planes
+from analysis.bit_features import trajectory_features
 
 class ResonanceExperiments:
     def __init__(self):
@@ -24,24 +26,9 @@ class ResonanceExperiments:
         Lower entropy suggests more predictable patterns
         """
         trajectory = self.analyzer.get_trajectory(n)
-        entropies = []
         
-        for num in trajectory:
-            binary = bin(num)[2:]
-            if len(binary) > 1:
-                # Calculate probability of 0s and 1s
-                p1 = binary.count('1') / len(binary)
-                p0 = 1 - p1
-                
-                # Shannon entropy
-                entropy = 0
-                if p0 > 0:
-                    entropy -= p0 * np.log2(p0)
-                if p1 > 0:
-                    entropy -= p1 * np.log2(p1)
-                entropies.append(entropy)
-            else:
-                entropies.append(0)
+        # Shannon entropy of the 0/1 proportions of each value (0 for 1-bit values)
+        entropies = trajectory_features(trajectory)['entropy'].tolist()
         
         return {
             'number': n,
@@ -58,14 +45,8 @@ class ResonanceExperiments:
         """
         trajectory = self.analyzer.get_trajectory(n)[:100]  # Limit for FFT
         
-        # Extract bit values at specific position
-        bit_series = []
-        for num in trajectory:
-            binary = bin(num)[2:].zfill(32)  # Pad to 32 bits
-            if bit_position < len(binary):
-                bit_series.append(int(binary[-(bit_position+1)]))  # LSB = position 0
-            else:
-                bit_series.append(0)
+        # Extract bit values at specific position (LSB = position 0)
+        bit_series = bit_planes(trajectory, bit_position + 1, msb_first=False)[:, bit_position].astype(np.int64)
         
         if len(bit_series) < 4:
             return {'error': 'Trajectory too short for FFT'}
@@ -96,34 +77,20 @@ class ResonanceExperiments:
         # Initialize quantum-like state vector
         max_bits = max(x.bit_length() for x in trajectory[:20])
         
-        states = []
-        for num in trajectory[:20]:  # Limit for computational efficiency
-            # Create state vector (amplitudes for each bit)
-            binary = bin(num)[2:].zfill(max_bits)
-            state = np.array([complex(int(b)) for b in binary])
-            
-            # Normalize (quantum state normalization)
-            norm = np.sqrt(np.sum(np.abs(state) ** 2))
-            if norm > 0:
-                state = state / norm
-            
-            states.append(state)
+        # Create state vectors (amplitudes for each bit), one row per step
+        states = bit_planes(trajectory[:20], max_bits).astype(complex)  # Limit for computational efficiency
+        
+        # Normalize (quantum state normalization)
+        norms = np.sqrt(np.sum(np.abs(states) ** 2, axis=1, keepdims=True))
+        states = np.divide(states, norms, out=states, where=norms > 0)
         
-        # Calculate "quantum" metrics
-        coherence_scores = []
-        for i in range(len(states) - 1):
-            # Overlap between consecutive states (fidelity)
-            overlap = np.abs(np.vdot(states[i], states[i+1])) ** 2
-            coherence_scores.append(overlap)
+        # Calculate "quantum" metrics: overlap between consecutive states (fidelity)
+        coherence_scores = (np.abs(np.sum(np.conj(states[:-1]) * states[1:], axis=1)) ** 2).tolist()
         
-        # Entanglement-like measure (correlation between bit positions)
+        # Entanglement-like measure (correlation between bit positions i < j)
         if len(states) > 2:
-            bit_correlations = np.zeros((max_bits, max_bits))
-            for state in states:
-                for i in range(max_bits):
-                    for j in range(i+1, max_bits):
-                        bit_correlations[i, j] += np.abs(state[i] * np.conj(state[j]))
-            bit_correlations /= len(states)
+            magnitudes = np.abs(states)
+            bit_correlations = np.triu(magnitudes.T @ magnitudes, k=1) / len(states)
         else:
             bit_correlations = None
         
@@ -141,6 +108,7 @@ class ResonanceExperiments:
         """
         attractor_candidates = {}
         
+        self.analyzer.prefetch_trajectories(range(1, sample_size + 1))
         for n in range(1, sample_size + 1):
             trajectory = self.analyzer.get_trajectory(n)
             
@@ -8,8 +8,15 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy import signal
 from scipy.fft import fft, fftfreq, ifft
-from typing import List, Dict, Tuple
+from typing import List, Dict, Iterator, Optional, Tuple
 import json
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.trajectory_engine import collatz_step, get_trajectory, batch_trajectories
+from analysis.bit_features import trajectory_features
+from analysis.phase_space import phase_points, find_attractors
+from analysis.resonance_index import RESONANCE_THRESHOLD, resonant_pair_blocks, resonant_pairs
 
 class BinarySymphonyAnalyzer:
     """
@@ -20,15 +27,13 @@ class BinarySymphonyAnalyzer:
         self.musical_discoveries = []
         
     def collatz_step(self, n: int) -> int:
-        return 3 * n + 1 if n & 1 else n >> 1
+        return collatz_step(n)
     
     def get_trajectory(self, n: int, max_steps: int = 1000) -> List[int]:
-        trajectory = [n]
-        current = n
-        while current != 1 and len(trajectory) < max_steps:
-            current = self.collatz_step(current)
-            trajectory.append(current)
-        return trajectory
+        return get_trajectory(n, max_steps)
+    
+    def get_trajectories(self, numbers: List[int], max_steps: int = 1000) -> List[List[int]]:
+        return batch_trajectories(numbers, max_steps)
     
     def binary_to_waveform(self, n: int, sample_length: int = 256) -> np.ndarray:
         """
@@ -37,46 +42,19 @@ class BinarySymphonyAnalyzer:
         trajectory = self.get_trajectory(n, sample_length)
         
         # Multiple representations as waveforms
+        features = trajectory_features(trajectory)
         waveforms = {
-            'bit_density': [],  # Density of 1s
-            'bit_width': [],    # Binary width
-            'hamming': [],      # Hamming weight
-            'center_mass': [],  # Center of mass of 1s
-            'entropy': []       # Shannon entropy
+            'bit_density': features['density'],        # Density of 1s
+            'bit_width': features['bit_length'],       # Binary width
+            'hamming': features['popcount'],           # Hamming weight
+            'center_mass': features['center_of_mass'], # Center of mass of 1s
+            'entropy': features['entropy']             # Shannon entropy
         }
         
-        for num in trajectory:
-            binary = bin(num)[2:]
-            ones = binary.count('1')
-            
-            # Bit density
-            waveforms['bit_density'].append(ones / len(binary) if len(binary) > 0 else 0)
-            
-            # Bit width
-            waveforms['bit_width'].append(len(binary))
-            
-            # Hamming weight
-            waveforms['hamming'].append(ones)
-            
-            # Center of mass
-            positions = [i for i, bit in enumerate(reversed(binary)) if bit == '1']
-            com = sum(positions) / len(positions) if positions else 0
-            waveforms['center_mass'].append(com)
-            
-            # Shannon entropy
-            if ones > 0 and ones < len(binary):
-                p1 = ones / len(binary)
-                p0 = 1 - p1
-                entropy = -(p1 * np.log2(p1) + p0 * np.log2(p0))
-            else:
-                entropy = 0
-            waveforms['entropy'].append(entropy)
-        
-        # Pad to sample_length if needed
+        # Pad to sample_length (repeating the last value) if needed
         for key in waveforms:
-            if len(waveforms[key]) < sample_length:
-                waveforms[key].extend([waveforms[key][-1]] * (sample_length - len(waveforms[key])))
-            waveforms[key] = np.array(waveforms[key][:sample_length])
+            waveforms[key] = np.pad(waveforms[key], (0, max(0, sample_length - len(trajectory))),
+                                    mode='edge')[:sample_length]
         
         return waveforms
     
@@ -162,112 +140,114 @@ class BinarySymphonyAnalyzer:
         
         return results
     
-    def find_resonant_pairs(self, start: int, end: int) -> List[Tuple[int, int, float]]:
+    def frequency_signatures(self, numbers: List[int], sample_length: int = 128,
+                             chunk: int = 2**14) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Find pairs of numbers with resonant (similar) frequency signatures
+        (fundamental, spectral centroid) of the bit-density waveform of each
+        number, as find_fundamental_frequency(binary_to_waveform(n, sample_length)['bit_density'])
+        but with the trajectories, spectra and peak searches batched
+        """
+        fundamentals = np.zeros(len(numbers))
+        centroids = np.zeros(len(numbers))
+        freqs = fftfreq(sample_length)[:sample_length // 2]
+        
+        for offset in range(0, len(numbers), chunk):
+            trajectories = self.get_trajectories(numbers[offset:offset + chunk], sample_length)
+            
+            # Bit-density waveforms, padded with each trajectory's last value
+            lengths = np.array([len(t) for t in trajectories])
+            density = trajectory_features([x for t in trajectories for x in t])['density']
+            starts = np.cumsum(lengths) - lengths
+            columns = np.minimum(np.arange(sample_length), lengths[:, None] - 1)
+            waveforms = density[starts[:, None] + columns]
+            
+            magnitude = np.abs(fft(waveforms, axis=1))
+            half = magnitude[:, :sample_length // 2]
+            height = np.max(magnitude, axis=1) * 0.1
+            
+            # Lowest strict local maximum above 10% of the peak magnitude
+            inner = half[:, 1:-1]
+            peaks = (inner > half[:, :-2]) & (inner > half[:, 2:]) & (inner >= height[:, None])
+            fundamental_idx = np.argmax(peaks, axis=1) + 1
+            found = peaks.any(axis=1)
+            
+            # Flat-topped peaks: defer to signal.find_peaks for those rows
+            for row in np.flatnonzero((half[:, 1:] == half[:, :-1]).any(axis=1)):
+                row_peaks, _ = signal.find_peaks(half[row], height=height[row])
+                found[row] = len(row_peaks) > 0
+                fundamental_idx[row] = row_peaks[0] if found[row] else 0
+            
+            window = slice(offset, offset + len(trajectories))
+            fundamentals[window] = np.where(found, freqs[fundamental_idx], 0)
+            centroids[window] = np.where(found, np.sum(freqs * half, axis=1) / np.sum(half, axis=1), 0)
+        
+        return fundamentals, centroids
+    
+    def iter_resonant_pairs(self, start: int, end: int,
+                            threshold: float = RESONANCE_THRESHOLD) -> Iterator[Tuple[int, int, float]]:
+        """
+        Stream the pairs n1 < n2 in [start, end] with resonant (similar) frequency
+        signatures, using a fundamental/centroid index rather than all pairs
+        """
+        numbers = list(range(start, end + 1))
+        fundamentals, centroids = self.frequency_signatures(numbers)
+        return resonant_pairs(numbers, fundamentals, centroids, threshold)
+    
+    def find_resonant_pairs(self, start: int, end: int,
+                            top: Optional[int] = None) -> List[Tuple[int, int, float]]:
+        """
+        Find pairs of numbers with resonant (similar) frequency signatures,
+        sorted by similarity. Every pair is returned unless `top` is given,
+        in which case only the best `top` are kept and memory stays bounded
+        by `top` and one block of matches. For large ranges use
+        iter_resonant_pairs, which streams the pairs instead of listing them.
         """
         print(f"\n{'='*60}")
         print("SEARCHING FOR RESONANT NUMBER PAIRS")
         print(f"{'='*60}")
         
-        signatures = {}
-        
-        # Calculate frequency signatures for each number
-        for n in range(start, end + 1):
-            waveform = self.binary_to_waveform(n, 128)['bit_density']
-            freq_analysis = self.find_fundamental_frequency(waveform)
-            signatures[n] = {
-                'fundamental': freq_analysis['fundamental'],
-                'centroid': freq_analysis['spectral_centroid']
-            }
-        
-        # Find resonant pairs
-        resonant_pairs = []
-        
-        for n1 in range(start, end):
-            for n2 in range(n1 + 1, end + 1):
-                sig1 = signatures[n1]
-                sig2 = signatures[n2]
-                
-                # Calculate similarity
-                if sig1['fundamental'] != 0 and sig2['fundamental'] != 0:
-                    freq_similarity = 1 - abs(sig1['fundamental'] - sig2['fundamental'])
-                    centroid_similarity = 1 - abs(sig1['centroid'] - sig2['centroid'])
-                    
-                    total_similarity = (freq_similarity + centroid_similarity) / 2
-                    
-                    if total_similarity > 0.9:  # High resonance
-                        resonant_pairs.append((n1, n2, total_similarity))
-        
-        # Sort by similarity
-        resonant_pairs.sort(key=lambda x: x[2], reverse=True)
-        
-        print(f"\nFound {len(resonant_pairs)} resonant pairs")
+        numbers = list(range(start, end + 1))
+        fundamentals, centroids = self.frequency_signatures(numbers)
+        
+        found = 0
+        kept = []
+        for block in resonant_pair_blocks(numbers, fundamentals, centroids):
+            found += len(block[0])
+            kept.append(block)
+            if top is not None:
+                # Fold the block into the running best `top` pairs
+                kept = [_rank_pairs(*(np.concatenate(column) for column in zip(*kept)), top)]
+        resonant = []
+        if kept:
+            first, second, scores = _rank_pairs(*(np.concatenate(column) for column in zip(*kept)), top)
+            resonant = list(zip(first.tolist(), second.tolist(), scores.tolist()))
+        
+        print(f"\nFound {found} resonant pairs")
         print("Top resonant pairs:")
-        for n1, n2, similarity in resonant_pairs[:5]:
+        for n1, n2, similarity in resonant[:5]:
             print(f"  {n1} ↔ {n2}: {similarity:.3f} resonance")
         
-        return resonant_pairs
+        return resonant
     
-    def create_phase_diagram(self, n: int) -> Dict:
+    def create_phase_diagram(self, n: int, max_steps: Optional[int] = 200) -> Dict:
         """
         Create a phase space diagram of the binary dynamics
+        (max_steps=None uses the full trajectory)
         """
-        trajectory = self.get_trajectory(n, 200)
-        
-        # Create phase space coordinates
-        x = []  # Bit density
-        y = []  # Rate of change of bit density
-        z = []  # Binary width
-        
-        for i in range(len(trajectory) - 1):
-            curr_binary = bin(trajectory[i])[2:]
-            next_binary = bin(trajectory[i + 1])[2:]
-            
-            curr_density = curr_binary.count('1') / len(curr_binary)
-            next_density = next_binary.count('1') / len(next_binary)
-            
-            x.append(curr_density)
-            y.append(next_density - curr_density)  # Rate of change
-            z.append(len(curr_binary))
-        
-        # Find attractors in phase space
-        # Cluster points to find dense regions
-        points = np.column_stack((x, y))
-        
-        # Simple clustering - find regions with many nearby points
-        attractors = []
-        for i in range(len(points)):
-            nearby = 0
-            for j in range(len(points)):
-                if i != j:
-                    dist = np.linalg.norm(points[i] - points[j])
-                    if dist < 0.1:  # Threshold for "nearby"
-                        nearby += 1
-            
-            if nearby > len(points) * 0.1:  # More than 10% of points nearby
-                attractors.append({
-                    'density': x[i],
-                    'change_rate': y[i],
-                    'width': z[i],
-                    'strength': nearby
-                })
-        
-        # Remove duplicates
-        unique_attractors = []
-        for attr in attractors:
-            is_unique = True
-            for unique in unique_attractors:
-                if abs(attr['density'] - unique['density']) < 0.05 and \
-                   abs(attr['change_rate'] - unique['change_rate']) < 0.05:
-                    is_unique = False
-                    break
-            if is_unique:
-                unique_attractors.append(attr)
+        return self.create_range_phase_diagram([n], max_steps)
+    
+    def create_range_phase_diagram(self, numbers: List[int], max_steps: Optional[int] = None) -> Dict:
+        """
+        Phase space diagram of several trajectories merged together
+        """
+        # x: bit density, y: rate of change of bit density, z: binary width
+        x, y, z = phase_points(self.get_trajectories(numbers, max_steps))
         
+        # Attractors: points with more than 10% of all points within 0.1,
+        # found with a k-d tree and de-duplicated on a 0.05 grid
         return {
-            'phase_points': {'x': x, 'y': y, 'z': z},
-            'attractors': unique_attractors
+            'phase_points': {'x': x.tolist(), 'y': y.tolist(), 'z': z.tolist()},
+            'attractors': find_attractors(x, y, z)
         }
     
     def find_binary_melodies(self, n: int) -> Dict:
@@ -403,6 +383,12 @@ in the discrete space of integers, with each number contributing its
 unique voice to the grand composition.
         """)
 
+def _rank_pairs(first: np.ndarray, second: np.ndarray, similarity: np.ndarray,
+                top: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pairs sorted by similarity (highest first, ties in (n1, n2) order), cut to top"""
+    order = np.lexsort((second, first, -similarity))[:top]
+    return first[order], second[order], similarity[order]
+
 def demonstrate_binary_symphony():
     """Run demonstration of binary symphony analysis"""
     analyzer = BinarySymphonyAnalyzer()
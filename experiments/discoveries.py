@@ -7,6 +7,11 @@ import numpy as np
 import matplotlib.pyplot as plt
 from typing import List, Dict, Tuple
 import json
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.trajectory_engine import collatz_step, get_trajectory, batch_trajectories
+from analysis.bit_features import trajectory_features
 
 class BinaryResonanceDiscoveries:
     """
@@ -18,15 +23,13 @@ class BinaryResonanceDiscoveries:
         self.discoveries = []
         
     def collatz_step(self, n: int) -> int:
-        return 3 * n + 1 if n & 1 else n >> 1
+        return collatz_step(n)
     
     def get_trajectory(self, n: int, max_steps: int = 1000) -> List[int]:
-        trajectory = [n]
-        current = n
-        while current != 1 and len(trajectory) < max_steps:
-            current = self.collatz_step(current)
-            trajectory.append(current)
-        return trajectory
+        return get_trajectory(n, max_steps)
+    
+    def get_trajectories(self, numbers: List[int], max_steps: int = 1000) -> List[List[int]]:
+        return batch_trajectories(numbers, max_steps)
     
     def discovery_1_power_of_2_minus_1_pattern(self):
         """
@@ -153,29 +156,19 @@ class BinaryResonanceDiscoveries:
         print("=" * 60)
         
         trajectory = self.get_trajectory(n, 100)
-        info_flow = []
         
-        for num in trajectory:
-            binary = bin(num)[2:]
-            ones = binary.count('1')
-            zeros = len(binary) - ones
-            
-            # Shannon entropy
-            if ones > 0 and zeros > 0:
-                p1 = ones / len(binary)
-                p0 = zeros / len(binary)
-                entropy = -(p1 * np.log2(p1) + p0 * np.log2(p0))
-            else:
-                entropy = 0
-            
-            total_info = len(binary) * entropy
-            
-            info_flow.append({
+        # Shannon entropy and bit width of every value in one pass
+        features = trajectory_features(trajectory)
+        info_flow = [
+            {
                 'value': num,
-                'bits': len(binary),
-                'entropy': entropy,
-                'total_information': total_info
-            })
+                'bits': int(bits),
+                'entropy': float(entropy),
+                'total_information': float(info)
+            }
+            for num, bits, entropy, info in zip(trajectory, features['bit_length'],
+                                                features['entropy'], features['information'])
+        ]
         
         # Find information peaks
         max_info = max(i['total_information'] for i in info_flow)
@@ -286,9 +279,7 @@ class BinaryResonanceDiscoveries:
         test_numbers = [27, 31, 39, 47, 55, 63, 71]
         similarities = []
         
-        for n in test_numbers:
-            trajectory = self.get_trajectory(n, 200)
-            
+        for n, trajectory in zip(test_numbers, self.get_trajectories(test_numbers, 200)):
             # Convert to bit density sequence
             densities = []
             for num in trajectory:
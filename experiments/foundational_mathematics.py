@@ -9,6 +9,10 @@ from typing import List, Dict, Set, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 import hashlib
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.trajectory_engine import collatz_step, get_trajectory, batch_trajectories
 
 class FoundationalStructures:
     """
@@ -20,15 +24,13 @@ class FoundationalStructures:
         self.foundational_discoveries = []
     
     def collatz_step(self, n: int) -> int:
-        return 3 * n + 1 if n & 1 else n >> 1
+        return collatz_step(n)
     
     def get_trajectory(self, n: int, max_steps: int = 1000) -> List[int]:
-        trajectory = [n]
-        current = n
-        while current != 1 and len(trajectory) < max_steps:
-            current = self.collatz_step(current)
-            trajectory.append(current)
-        return trajectory
+        return get_trajectory(n, max_steps)
+    
+    def get_trajectories(self, numbers: List[int], max_steps: int = 1000) -> List[List[int]]:
+        return batch_trajectories(numbers, max_steps)
     
     def discover_binary_topos_theory(self, n: int) -> Dict:
         """
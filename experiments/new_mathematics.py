@@ -9,6 +9,10 @@ from scipy import special, integrate
 from typing import List, Dict, Tuple, Optional
 import itertools
 from collections import defaultdict
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.trajectory_engine import collatz_step, get_trajectory, batch_trajectories
 
 class NewMathematicalStructures:
     """
@@ -20,15 +24,13 @@ class NewMathematicalStructures:
         self.discoveries = []
         
     def collatz_step(self, n: int) -> int:
-        return 3 * n + 1 if n & 1 else n >> 1
+        return collatz_step(n)
     
     def get_trajectory(self, n: int, max_steps: int = 1000) -> List[int]:
-        trajectory = [n]
-        current = n
-        while current != 1 and len(trajectory) < max_steps:
-            current = self.collatz_step(current)
-            trajectory.append(current)
-        return trajectory
+        return get_trajectory(n, max_steps)
+    
+    def get_trajectories(self, numbers: List[int], max_steps: int = 1000) -> List[List[int]]:
+        return batch_trajectories(numbers, max_steps)
     
     def discover_binary_derived_category(self, n: int) -> Dict:
         """
@@ -87,16 +89,8 @@ class NewMathematicalStructures:
     
     def _compute_binary_differential(self, a: int, b: int) -> int:
         """Differential in the chain complex"""
-        a_bin = bin(a)[2:]
-        b_bin = bin(b)[2:]
-        
-        # XOR gives the differential
-        max_len = max(len(a_bin), len(b_bin))
-        a_pad = a_bin.zfill(max_len)
-        b_pad = b_bin.zfill(max_len)
-        
-        diff = sum(1 for i in range(max_len) if a_pad[i] != b_pad[i])
-        return diff
+        # XOR gives the differential: the number of differing bits
+        return (a ^ b).bit_count()
     
     def _compute_ext_groups(self, complex: Dict) -> List[int]:
         """Compute Ext groups in derived category"""
@@ -8,6 +8,10 @@ import numpy as np
 from typing import List, Dict, Any, Optional
 import hashlib
 import json
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.trajectory_engine import collatz_step, get_trajectory, batch_trajectories
 
 class RealityMathematicsInterface:
     """
@@ -19,15 +23,13 @@ class RealityMathematicsInterface:
         self.reality_discoveries = []
         
     def collatz_step(self, n: int) -> int:
-        return 3 * n + 1 if n & 1 else n >> 1
+        return collatz_step(n)
     
     def get_trajectory(self, n: int, max_steps: int = 1000) -> List[int]:
-        trajectory = [n]
-        current = n
-        while current != 1 and len(trajectory) < max_steps:
-            current = self.collatz_step(current)
-            trajectory.append(current)
-        return trajectory
+        return get_trajectory(n, max_steps)
+    
+    def get_trajectories(self, numbers: List[int], max_steps: int = 1000) -> List[List[int]]:
+        return batch_trajectories(numbers, max_steps)
     
     def discover_computational_irreducibility(self, n: int) -> Dict:
         """
@@ -352,8 +354,7 @@ class RealityMathematicsInterface:
         pattern_counts = {}
         total_steps = 0
         
-        for n in numbers:
-            trajectory = self.get_trajectory(n, 100)
+        for n, trajectory in zip(numbers, self.get_trajectories(numbers, 100)):
             total_steps += len(trajectory)
             
             for val in trajectory:
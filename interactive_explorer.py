@@ -9,27 +9,25 @@ import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 import sys
 import os
+from analysis.trajectory_engine import collatz_step
+from analysis.trajectory_cache import TrajectoryCache
+from analysis.bit_planes import bit_planes
+from analysis.bit_features import trajectory_features
 
 class InteractiveExplorer:
-    def __init__(self):
+    def __init__(self, cache_bytes=64 * 2**20):
         self.current_n = 27
-        self.trajectory_cache = {}
+        self.trajectory_cache = TrajectoryCache(cache_bytes)
         
     def collatz_step(self, n):
-        return 3 * n + 1 if n & 1 else n >> 1
+        return collatz_step(n)
     
     def get_trajectory(self, n, max_steps=500):
-        if n in self.trajectory_cache:
-            return self.trajectory_cache[n]
-            
-        trajectory = [n]
-        current = n
-        while current != 1 and len(trajectory) < max_steps:
-            current = self.collatz_step(current)
-            trajectory.append(current)
-        
-        self.trajectory_cache[n] = trajectory
-        return trajectory
+        return self.trajectory_cache.trajectory(n, max_steps)
+    
+    def prefetch_trajectories(self, numbers, max_steps=500):
+        """Compute all uncached trajectories for numbers in one lockstep batch"""
+        self.trajectory_cache.prefetch(numbers, max_steps)
     
     def explore_number(self, n):
         """Interactive exploration of a single number"""
@@ -38,12 +36,13 @@ class InteractiveExplorer:
         print(f"{'='*70}")
         
         trajectory = self.get_trajectory(n)
+        features = trajectory_features(trajectory)
         
         # Basic stats
         print(f"\n📊 BASIC STATISTICS:")
         print(f"  Trajectory length: {len(trajectory)} steps")
         print(f"  Maximum value: {max(trajectory)} ({bin(max(trajectory))[2:]})")
-        print(f"  Maximum binary width: {max(len(bin(x)[2:]) for x in trajectory)} bits")
+        print(f"  Maximum binary width: {features['bit_length'].max()} bits")
         
         # Binary evolution (first 20 steps)
         print(f"\n🔄 BINARY EVOLUTION (first 20 steps):")
@@ -53,8 +52,8 @@ class InteractiveExplorer:
         for i in range(min(20, len(trajectory))):
             num = trajectory[i]
             binary = bin(num)[2:]
-            width = len(binary)
-            density = binary.count('1') / width
+            width = features['bit_length'][i]
+            density = features['density'][i]
             
             if i < len(trajectory) - 1:
                 op = "3n+1" if num & 1 else "n/2 "
@@ -95,18 +94,7 @@ class InteractiveExplorer:
         
         # Information cascade
         print(f"\n📈 INFORMATION CASCADE:")
-        info_values = []
-        for num in trajectory[:50]:
-            binary = bin(num)[2:]
-            ones = binary.count('1')
-            if 0 < ones < len(binary):
-                p1 = ones / len(binary)
-                p0 = 1 - p1
-                entropy = -(p1 * np.log2(p1) + p0 * np.log2(p0))
-                info = len(binary) * entropy
-            else:
-                info = 0
-            info_values.append(info)
+        info_values = features['information'][:50].tolist()
         
         if info_values:
             max_info = max(info_values)
@@ -119,12 +107,7 @@ class InteractiveExplorer:
         
         # Binary center of mass
         print(f"\n🌊 BINARY CENTER OF MASS WAVE:")
-        com_values = []
-        for num in trajectory[:30]:
-            binary = bin(num)[2:]
-            positions = [i for i, bit in enumerate(reversed(binary)) if bit == '1']
-            com = sum(positions) / len(positions) if positions else 0
-            com_values.append(com)
+        com_values = features['center_of_mass'][:30].tolist()
         
         print("  First 30 steps:")
         for i, com in enumerate(com_values):
@@ -233,12 +216,8 @@ class InteractiveExplorer:
         axes[1, 1].set_ylabel('Value')
         axes[1, 1].grid(True, alpha=0.3)
         
-        # 6. Binary heatmap
-        binary_matrix = np.zeros((min(50, len(trajectory)), 20))
-        for i in range(min(50, len(trajectory))):
-            binary = bin(trajectory[i])[2:].zfill(20)[-20:]
-            for j, bit in enumerate(binary):
-                binary_matrix[i, j] = int(bit)
+        # 6. Binary heatmap (low 20 bits, MSB to LSB)
+        binary_matrix = bit_planes(trajectory[:50], 20)
         
         im = axes[1, 2].imshow(binary_matrix, cmap='YlOrRd', aspect='auto')
         axes[1, 2].set_title('Binary Pattern Heatmap')
@@ -346,6 +325,7 @@ class InteractiveExplorer:
             'slow_convergence': []
         }
         
+        self.prefetch_trajectories(range(start, end + 1))
         for n in range(start, end + 1):
             trajectory = self.get_trajectory(n)
             
@@ -7,21 +7,26 @@ This code provides evidence for theorems and discovers new patterns.
 """
 
 import numpy as np
-from scipy import stats, special
+from scipy import special
 from math import gcd, log2
 import matplotlib.pyplot as plt
 from collections import defaultdict, Counter
-from sympy import factorint, isprime, totient
-from functools import lru_cache
+from analysis.stopping_times import persist_default_table
+from analysis.stopping_engine import default_engine
+from analysis.shift_sequence import SHIFTS
+from analysis.multiplicative_order import multiplicative_order
+from analysis.factor_db import default_factor_db
+from analysis.prime_sweep import sweep_prime_indices
+from analysis.shift_window import DEFAULT_CHUNK, as_ints, matched_controls, shift_window
+from analysis.streaming_stats import GroupStatistics, welch_ttest, variance_ftest
 
 class BinaryInverseSequence:
     """Class for studying s_n = (2^(2n+1) + 1)/3"""
     
     @staticmethod
-    @lru_cache(maxsize=1000)
     def s(n):
         """Generate the nth term of the sequence"""
-        return (2**(2*n + 1) + 1) // 3
+        return SHIFTS[n]
     
     @staticmethod
     def verify_main_theorem():
@@ -106,18 +111,13 @@ class BinaryInverseSequence:
         
         factor_data = []
         for n in range(2, 25):
-            s_n = BinaryInverseSequence.s(n)
-            factors = factorint(s_n)
+            factors = default_factor_db().factorization(n)
             
             # Check multiplicative order condition
             for p in factors:
                 if p != 2:  # p must be odd
                     # Find multiplicative order of 2 mod p
-                    order = 1
-                    temp = 2
-                    while temp % p != 1 and order < p:
-                        temp = (temp * 2) % p
-                        order += 1
+                    order = multiplicative_order(2, p)
                     
                     # Check if order divides 2n
                     divides_2n = (2*n) % order == 0
@@ -142,11 +142,7 @@ class BinaryInverseSequence:
         """Test which s_n are prime"""
         print("\nTesting Primality of s_n...")
         
-        primes_found = []
-        for n in range(50):
-            s_n = BinaryInverseSequence.s(n)
-            if isprime(s_n):
-                primes_found.append((n, s_n))
+        primes_found = [(n, BinaryInverseSequence.s(n)) for n in sweep_prime_indices(50)]
         
         print(f"  Prime values found: {primes_found}")
         
@@ -230,9 +226,11 @@ class BinaryInverseSequence:
         return patterns
     
     @staticmethod
-    def collatz_statistical_analysis(sample_size=10000):
+    def collatz_statistical_analysis(sample_size=10000, chunk=DEFAULT_CHUNK):
         """
-        Rigorous statistical analysis of Collatz trajectories near shift values
+        Rigorous statistical analysis of Collatz trajectories near shift values.
+        Samples are streamed chunk at a time into running moments, so memory
+        does not grow with sample_size.
         """
         print("\nCollatz Trajectory Statistical Analysis...")
         print(f"  Sample size: {sample_size} odd integers per shift")
@@ -242,51 +240,31 @@ class BinaryInverseSequence:
         for n in range(2, 7):  # Test shifts s_2 through s_6
             s_n = BinaryInverseSequence.s(n)
             
-            # Collect trajectory data near shift
-            shift_trajectories = []
-            shift_max_values = []
-            shift_stopping_times = []
-            
-            # Sample around the shift
-            for offset in range(-sample_size//2, sample_size//2):
-                test_n = s_n + 2*offset  # Keep odd
-                if test_n > 0:
-                    traj_len, max_val, stop_time = BinaryInverseSequence._analyze_trajectory(test_n)
-                    shift_trajectories.append(traj_len)
-                    shift_max_values.append(max_val)
-                    shift_stopping_times.append(stop_time)
+            # Sample around the shift: one contiguous window of odd integers > 0
+            shift_stats = GroupStatistics()
+            for start, count in shift_window(s_n, sample_size).blocks(chunk):
+                shift_stats.update(*BinaryInverseSequence._analyze_window(start, count))
             
-            # Random control group
-            control_trajectories = []
-            control_max_values = []
-            control_stopping_times = []
+            # Use similar magnitude random odd numbers as the control group
+            control_stats = GroupStatistics()
+            for numbers in matched_controls(s_n, sample_size, chunk=chunk):
+                control_stats.update(*BinaryInverseSequence._analyze_trajectories(as_ints(numbers)))
             
-            # Use similar magnitude random odd numbers
-            for _ in range(sample_size):
-                rand_n = 2*np.random.randint(s_n//2, 2*s_n) + 1
-                traj_len, max_val, stop_time = BinaryInverseSequence._analyze_trajectory(rand_n)
-                control_trajectories.append(traj_len)
-                control_max_values.append(max_val)
-                control_stopping_times.append(stop_time)
-            
-            # Statistical tests
-            traj_t, traj_p = stats.ttest_ind(shift_trajectories, control_trajectories)
-            max_t, max_p = stats.ttest_ind(
-                np.log(shift_max_values), np.log(control_max_values)
+            # Statistical tests (Welch, from the summary statistics)
+            traj_t, traj_p = welch_ttest(shift_stats.trajectories, control_stats.trajectories)
+            max_t, max_p = welch_ttest(
+                shift_stats.max_values.moments, control_stats.max_values.moments
             )  # Log scale for max values
-            stop_t, stop_p = stats.ttest_ind(shift_stopping_times, control_stopping_times)
+            stop_t, stop_p = welch_ttest(shift_stats.stopping_times, control_stats.stopping_times)
             
             # Variance tests
-            shift_var = np.var(shift_trajectories)
-            control_var = np.var(control_trajectories)
-            f_stat = shift_var / control_var if control_var > 0 else float('inf')
-            var_p = stats.f.sf(f_stat, len(shift_trajectories)-1, len(control_trajectories)-1)
+            f_stat, var_p = variance_ftest(shift_stats.trajectories, control_stats.trajectories)
             
             result = {
                 'n': n,
                 's_n': s_n,
-                'mean_traj_shift': np.mean(shift_trajectories),
-                'mean_traj_control': np.mean(control_trajectories),
+                'mean_traj_shift': shift_stats.trajectories.mean,
+                'mean_traj_control': control_stats.trajectories.mean,
                 'trajectory_p_value': traj_p,
                 'max_value_p_value': max_p,
                 'stopping_time_p_value': stop_p,
@@ -303,33 +281,24 @@ class BinaryInverseSequence:
             if var_p < 0.05:
                 print(f"    *** Significant variance difference detected! ***")
         
+        print(f"\n  Stopping-time engine: {default_engine().report()}")
+        persist_default_table()
         return results
     
     @staticmethod
     def _analyze_trajectory(n):
-        """Helper function to analyze a single Collatz trajectory"""
-        original = n
-        steps = 0
-        max_val = n
-        
-        # Stopping time: steps until n < original
-        stopping_time = 0
-        found_stopping = False
-        
-        while n != 1 and steps < 1000:
-            if n % 2 == 0:
-                n = n // 2
-            else:
-                n = 3*n + 1
-                max_val = max(max_val, n)
-            
-            steps += 1
-            
-            if not found_stopping and n < original:
-                stopping_time = steps
-                found_stopping = True
-        
-        return steps, max_val, stopping_time
+        """Helper function to analyze a single Collatz trajectory (exact, no step cap)"""
+        return default_engine().lookup(n)
+    
+    @staticmethod
+    def _analyze_trajectories(numbers):
+        """Vectorised _analyze_trajectory over many numbers (table lookups)"""
+        return default_engine().lookup_many(numbers)
+    
+    @staticmethod
+    def _analyze_window(start, count):
+        """_analyze_trajectory for the odd numbers start, start+2, ... (table slices)"""
+        return default_engine().window(start, count)
     
     @staticmethod
     def discover_new_patterns():
@@ -374,7 +343,7 @@ class BinaryInverseSequence:
         totients = []
         for n in range(1, 15):
             s_n = BinaryInverseSequence.s(n)
-            phi = totient(s_n)
+            phi = default_factor_db().totient(n)
             totients.append(phi)
             
             # Check relationship with 2^k
@@ -417,8 +386,8 @@ class BinaryInverseSequence:
             s_n = BinaryInverseSequence.s(n)
             binary = bin(s_n)[2:]
             base4 = np.base_repr(s_n, 4)
-            is_prime = "Yes" if isprime(s_n) else "No"
-            phi = totient(s_n)
+            is_prime = "Yes" if default_factor_db().is_prime(n) else "No"
+            phi = default_factor_db().totient(n)
             
             print(f"{n} & {s_n} & {binary} & {base4} & {is_prime} & {phi} \\\\")
         
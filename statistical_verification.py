@@ -5,18 +5,14 @@ Specific verification of statistical claims about p-values and variance ratios.
 
 import numpy as np
 from scipy import stats
-import random
+from analysis.stopping_times import persist_default_table
+from analysis.stopping_engine import default_engine
+from analysis.shift_sequence import SHIFTS
+from analysis.shift_window import matched_controls, shift_window
 
 def collatz_trajectory_length(n):
-    """Compute Collatz trajectory length"""
-    steps = 0
-    while n != 1 and steps < 10000:  # Safety limit
-        if n % 2 == 0:
-            n = n // 2
-        else:
-            n = 3*n + 1
-        steps += 1
-    return steps if n == 1 else -1  # Return -1 if didn't reach 1
+    """Exact Collatz trajectory length (shared stopping-time engine, no step cap)"""
+    return default_engine().total_stopping_time(n)
 
 def verify_statistical_claims():
     """Verify the statistical claims with smaller samples for verification"""
@@ -35,24 +31,13 @@ def verify_statistical_claims():
     for n, s_n in sequence_values:
         print(f"\nAnalyzing shift s_{n} = {s_n}:")
         
-        # Sample around the shift
-        shift_trajectories = []
-        for offset in range(-sample_size//2, sample_size//2):
-            test_val = s_n + 2*offset  # Keep odd
-            if test_val > 0:
-                traj_len = collatz_trajectory_length(test_val)
-                if traj_len > 0:  # Valid trajectory
-                    shift_trajectories.append(traj_len)
+        # Sample around the shift: one contiguous window of odd values > 0
+        window = shift_window(s_n, sample_size)
+        shift_trajectories = default_engine().window(window.start, len(window))[0]
         
-        # Random control group of similar magnitude
-        control_trajectories = []
-        random.seed(42)  # Reproducible
-        for _ in range(sample_size):
-            # Generate random odd number in similar range
-            rand_val = 2*random.randint(s_n//2, 2*s_n) + 1
-            traj_len = collatz_trajectory_length(rand_val)
-            if traj_len > 0:
-                control_trajectories.append(traj_len)
+        # Random control group of similar magnitude (seeded: reproducible)
+        control_trajectories = np.concatenate([default_engine().lookup_many(chunk)[0]
+                                               for chunk in matched_controls(s_n, sample_size, rng=42)])
         
         if len(shift_trajectories) > 100 and len(control_trajectories) > 100:
             # Statistical comparison
@@ -86,13 +71,16 @@ def verify_statistical_claims():
                 print(f"  ❌ No significant variance difference: p = {var_p_value:.6f}")
         else:
             print(f"  ❌ Insufficient valid trajectories for analysis")
+    
+    print(f"\nStopping-time engine: {default_engine().report()}")
+    persist_default_table()
 
 def verify_2adic_convergence():
     """Verify 2-adic convergence claim"""
     print("\n=== VERIFYING 2-ADIC CONVERGENCE ===")
     
     def binary_inverse_sequence(n):
-        return (2**(2*n + 1) + 1) // 3
+        return SHIFTS[n]
     
     def two_adic_distance(a, b):
         """Compute 2-adic distance |a - b|_2"""
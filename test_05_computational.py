@@ -7,13 +7,20 @@ This extracts and tests all the functions defined in that file.
 import numpy as np
 import matplotlib.pyplot as plt
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import cupy as cp
+except ImportError:  # No GPU: everything runs on NumPy
+    cp = None
 
 def generate_shifts(n):
     """Generate the first n shift values."""
     shifts = []
+    s = 1  # s_0; then s_{i+1} = 4 s_i - 1, no powers of 2 recomputed
     for i in range(n):
-        s = (2**(2*i + 1) + 1) // 3
         shifts.append(s)
+        s = (s << 2) - 1
     return shifts
 
 def verify_property(s):
@@ -52,16 +59,38 @@ def analyze_alignment(shift, count=1000):
     return matches
 
 def detect_periodicity(shift, max_n=1000):
-    """Detect the period of trailing zero pattern."""
-    sequence = []
-    for i in range(max_n):
-        n = shift + 2*i
-        tz = trailing_zeros(n + 1)
-        sequence.append(tz)
-    
-    # Find period
+    """
+    Detect the period of trailing zero pattern.
+
+    The sequence is v2(shift + 1 + 2i), i < max_n; the period is the
+    smallest p < max_n // 2 whose prefix repeats immediately.
+    - Even shift: every term is 0, so p = 1.
+    - Odd shift >= 1: terms are 1 + v2(b + i) with b = (shift + 1) / 2.
+      In any p consecutive integers the largest valuation u >= v2(p)
+      cannot recur p places later (v2(m + p) differs from v2(m) = u),
+      so no prefix repeats and there is no period.
+    Any other shift falls back to a linear-time Z-algorithm search.
+    """
+    if shift % 2 == 0:
+        if max_n // 2 > 1:
+            return 1, [0]
+        return None, [0] * min(max_n, 100)
+    if shift > 0:
+        return None, [trailing_zeros(shift + 2*i + 1) for i in range(min(max_n, 100))]
+
+    sequence = [trailing_zeros(shift + 2*i + 1) for i in range(max_n)]
+
+    # Find period: z[p] >= p means sequence[:p] == sequence[p:2*p]
+    z = [0] * len(sequence)
+    left = right = 0
     for period in range(1, len(sequence)//2):
-        if sequence[:period] == sequence[period:2*period]:
+        if period < right:
+            z[period] = min(right - period, z[period - left])
+        while period + z[period] < len(sequence) and sequence[z[period]] == sequence[period + z[period]]:
+            z[period] += 1
+        if period + z[period] > right:
+            left, right = period, period + z[period]
+        if z[period] >= period:
             return period, sequence[:period]
     return None, sequence[:100]
 
@@ -95,6 +124,57 @@ def verify_modular_inverse(s, k):
     """Verify that s is the modular inverse of 3 mod 2^k."""
     return (3 * s) % (2**k) == 1
 
+def get_array_module(backend='auto'):
+    """NumPy or CuPy module for backend 'numpy', 'cupy' or 'auto' (CuPy if installed)."""
+    if backend == 'cupy' or (backend == 'auto' and cp is not None):
+        if cp is None:
+            raise ImportError("backend 'cupy' requested but cupy is not installed")
+        return cp
+    return np
+
+def trailing_zeros_exact(xp, arr):
+    """Exact trailing zeros of int64 values (0 for zero)."""
+    arr = xp.where(arr == 0, 1, arr)
+    least_sig = arr & (-arr)
+    # A power of two converts to float exactly and frexp returns its
+    # integer exponent: no rounding, unlike log2
+    _, exponent = xp.frexp(xp.abs(least_sig.astype(xp.float64)))
+    return (exponent - 1).astype(xp.int32)
+
+def count_alignment_matches(xp, shift, start, stop):
+    """Matches v2(n+1) == v2(3m+1) for indices start..stop-1 (n = shift + 2i, m = 2i - 1)."""
+    indices = xp.arange(start, stop, dtype=xp.int64)
+    n_plus_1_seq = shift + 2 * indices
+    three_n_plus_1_seq = 3 * (2 * indices - 1) + 1
+    
+    tz1 = trailing_zeros_exact(xp, n_plus_1_seq + 1)
+    tz2 = trailing_zeros_exact(xp, three_n_plus_1_seq)
+    return int((tz1 == tz2).sum())
+
+def analyze_large_scale(shift, count=10_000_000, backend='auto', chunk_size=2**24, threads=1):
+    """
+    Fraction of alignment matches over count samples, in chunks of
+    chunk_size so memory stays bounded. NumPy chunks may run on several
+    threads (NumPy releases the GIL inside its kernels).
+    """
+    xp = get_array_module(backend)
+    chunks = [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+    
+    def run(bounds):
+        return count_alignment_matches(xp, shift, *bounds)
+    
+    if threads > 1 and xp is np:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            match_count = sum(executor.map(run, chunks))
+    else:
+        match_count = sum(run(bounds) for bounds in chunks)
+    
+    return match_count / count
+
+def analyze_large_scale_gpu(shift, count=10_000_000):
+    """GPU-accelerated analysis of alignment patterns (falls back to NumPy without CuPy)."""
+    return analyze_large_scale(shift, count, backend='auto')
+
 def run_verification_suite():
     """Run complete verification of discovered properties."""
     print("Shift Sequence Verification")
@@ -193,6 +273,26 @@ def test_all_functions():
             assert result, f"s_{i} = {s} should be inverse of 3 mod 2^{k}"
     print("✓ Modular inverse verification correct")
     
+    # Test 8: Periodicity detection (fast paths agree with brute force)
+    print("\n8. Testing periodicity detection:")
+    assert detect_periodicity(10, max_n=200) == (1, [0])
+    for shift in [-21, -7, 3, 11, 43]:
+        sequence = [trailing_zeros(shift + 2*i + 1) for i in range(200)]
+        periods = [p for p in range(1, 100) if sequence[:p] == sequence[p:2*p]]
+        expected = (periods[0], sequence[:periods[0]]) if periods else (None, sequence[:100])
+        assert detect_periodicity(shift, max_n=200) == expected, f"detect_periodicity({shift})"
+    print("✓ Periodicity detection correct")
+    
+    # Test 9: Large-scale alignment on the CPU backend (exact trailing zeros)
+    print("\n9. Testing large-scale alignment backend:")
+    values = np.array([1, 2, 12, 2**40, 2**62, -2, 0], dtype=np.int64)
+    assert trailing_zeros_exact(np, values).tolist() == [0, 1, 2, 40, 62, 1, 0]
+    shift, count = 43, 5000
+    expected = sum(trailing_zeros(shift + 2*i + 1) == trailing_zeros(3*(2*i - 1) + 1) for i in range(count))
+    assert analyze_large_scale(shift, count, backend='numpy', chunk_size=777) == expected / count
+    assert analyze_large_scale(shift, count, backend='numpy', chunk_size=777, threads=4) == expected / count
+    print("✓ Large-scale alignment backend correct")
+    
     print("\n" + "=" * 60)
     print("ALL FUNCTION TESTS PASSED!")
     print("=" * 60)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for the 2-adic alignment kernels in analysis/alignment.py.
+Valuations are checked against repeated halving.
+"""
+
+import math
+
+from analysis.alignment import (
+    trailing_zeros_u64, window_valuations, alignment_histograms, AlignmentAccumulator
+)
+
+def valuation(n):
+    """2-adic valuation by repeated halving."""
+    count = 0
+    while n % 2 == 0:
+        n //= 2
+        count += 1
+    return count
+
+def test_alignment_kernels():
+    """Vectorised v2(n+1), v2(3n+1) and histograms, including > 64-bit shifts."""
+    values = [1, 2, 12, 2**63, 2**64 - 2, 3 << 40]
+    assert trailing_zeros_u64(values).tolist() == [valuation(v) for v in values]
+
+    for shift in (171, 2**70 - 1, (2**66 - 1) // 3, (2**129 + 1) // 3):
+        tz1, tz2 = window_valuations(shift, -50, 100)
+        numbers = [shift + 2 * offset for offset in range(-50, 50)]
+        assert tz1.tolist() == [valuation(n + 1) for n in numbers]
+        assert tz2.tolist() == [valuation(3 * n + 1) for n in numbers]
+
+    dist_n_plus_1, dist_3n_plus_1, joint = alignment_histograms(43, 1000, chunk=64)
+    numbers = [43 + 2 * offset for offset in range(-500, 500) if 43 + 2 * offset > 0]
+    assert joint.sum() == len(numbers)
+    assert joint[1, 2] == sum(1 for n in numbers if valuation(n + 1) == 1 and valuation(3 * n + 1) == 2)
+    assert dist_3n_plus_1[1] == sum(1 for n in numbers if valuation(3 * n + 1) == 1)
+
+def test_alignment_accumulator():
+    """Chunked, merged accumulators agree with one pass and the dict MI."""
+    whole = AlignmentAccumulator()
+    whole.add_window(683, -300, 5000)
+    left, right = AlignmentAccumulator(), AlignmentAccumulator()
+    left.add_window(683, -300, 1234, chunk=100)
+    right.add_window(683, 934, 3766, chunk=77)
+    merged = left.merge(right)
+    assert (merged.joint == whole.joint).all() and merged.total == 5000
+
+    pairs = {}
+    for offset in range(-300, 4700):
+        n = 683 + 2 * offset
+        key = (valuation(n + 1), valuation(3 * n + 1))
+        pairs[key] = pairs.get(key, 0) + 1
+    first = {a: sum(c for (x, _), c in pairs.items() if x == a) for a, _ in pairs}
+    second = {b: sum(c for (_, y), c in pairs.items() if y == b) for _, b in pairs}
+    expected = sum(c / 5000 * math.log2((c / 5000) / (first[a] / 5000 * second[b] / 5000))
+                   for (a, b), c in pairs.items())
+    assert abs(whole.mutual_information() - expected) < 1e-12
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the binary trajectory analyzer in analysis/binary_analyzer.py.
+Bit statistics, resonance scores, sharded scans and Parquet export.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+from analysis.binary_analyzer import CollatzBinaryAnalyzer
+from test_trajectory_engine import reference_trajectory, reference_summary
+
+def test_binary_analysis():
+    """Integer-native bit statistics, also past 64 bits, in both output forms."""
+    analyzer = CollatzBinaryAnalyzer()
+    for n in (27, 2**70 + 1):
+        trajectory = reference_trajectory(n)
+        analysis = analyzer.binary_analysis(n)
+        assert analysis['binary_trajectory'] == [bin(x)[2:] for x in trajectory]
+        assert analysis['hamming_weights'] == [bin(x).count('1') for x in trajectory]
+        changed = [bin(x ^ y).count('1') for x, y in zip(trajectory, trajectory[1:])]
+        assert [t['bits_changed'] for t in analysis['bit_transitions']] == changed
+
+        arrays = analyzer.binary_analysis(n, as_arrays=True)
+        assert arrays['bit_lengths'].tolist() == analysis['bit_lengths']
+        assert arrays['bit_transitions']['bits_changed'].tolist() == changed
+
+def reference_resonance(trajectory):
+    """Resonance score by direct slice comparison."""
+    parity = [x & 1 for x in trajectory]
+    if len(parity) < 3:
+        return 0.0
+    score = 0
+    for p in range(2, min(len(parity) // 2, 10)):
+        score += p * sum(parity[i:i + p] == parity[i + p:i + 2 * p] for i in range(len(parity) - p))
+    return score / len(trajectory)
+
+def test_resonance_scores():
+    """Packed-parity and batched resonance scores match the slice definition."""
+    analyzer = CollatzBinaryAnalyzer()
+    trajectories = [reference_trajectory(n) for n in range(1, 400)] + [[], [7], [1, 2, 3, 4, 5, 6]]
+    expected = [reference_resonance(t) for t in trajectories]
+    assert [analyzer._calculate_resonance(t) for t in trajectories] == expected
+    assert analyzer.resonance_scores(trajectories).tolist() == expected
+
+def test_parallel_pattern_scan():
+    """Sharded find_binary_patterns reproduces the serial scan exactly."""
+    analyzer = CollatzBinaryAnalyzer()
+    analyzer.prefetch_chunk = 64  # force several shards on a small range
+    serial = analyzer.find_binary_patterns(1, 700)
+    parallel = analyzer.find_binary_patterns(1, 700, workers=3)
+    assert parallel == serial
+    for key in serial:
+        assert list(parallel[key]) == list(serial[key])  # same order as well
+
+def test_range_export():
+    """Parquet export streams one summary row per seed in bounded row groups."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    analyzer = CollatzBinaryAnalyzer()
+    path = os.path.join(tempfile.mkdtemp(), 'range.parquet')
+    assert analyzer.export_range(1, 1000, path, row_group_size=256) == 1000
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 4
+    rows = parquet.read().to_pydict()
+    assert rows['start'] == list(range(1, 1001))
+    assert rows['length'][26] == 112 and rows['max'][26] == 9232
+    assert rows['stopping_time'][26] == reference_summary(27)[2]
+    assert rows['resonance_score'][26] == analyzer.binary_analysis(27)['resonance_score']
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched frequency signatures in experiments/binary_symphony.py.
+Signatures and resonant pairs are checked against the per-number analysis.
+"""
+
+import numpy as np
+
+from experiments.binary_symphony import BinarySymphonyAnalyzer
+
+def reference_signature(analyzer, n):
+    """(fundamental, spectral centroid) of one number's bit-density waveform."""
+    analysis = analyzer.find_fundamental_frequency(analyzer.binary_to_waveform(n, 128)['bit_density'])
+    return analysis['fundamental'], analysis['spectral_centroid']
+
+def test_frequency_signatures():
+    """Batched signatures equal the per-number FFT and peak search."""
+    analyzer = BinarySymphonyAnalyzer()
+    numbers = list(range(1, 1500)) + [2**64 - 1, 2**70 + 1, 3**50]
+    fundamentals, centroids = analyzer.frequency_signatures(numbers, chunk=256)
+    expected = np.array([reference_signature(analyzer, n) for n in numbers])
+    assert fundamentals.tolist() == expected[:, 0].tolist()
+    assert np.allclose(centroids, expected[:, 1], rtol=1e-12, atol=0)
+
+def test_find_resonant_pairs():
+    """Every resonant pair is found by default, in order of similarity; top truncates."""
+    analyzer = BinarySymphonyAnalyzer()
+    start, end = 1, 300
+    signatures = {n: reference_signature(analyzer, n) for n in range(start, end + 1)}
+    expected = []
+    for n1 in range(start, end):
+        for n2 in range(n1 + 1, end + 1):
+            (f1, c1), (f2, c2) = signatures[n1], signatures[n2]
+            if f1 != 0 and f2 != 0:
+                similarity = ((1 - abs(f1 - f2)) + (1 - abs(c1 - c2))) / 2
+                if similarity > 0.9:
+                    expected.append((n1, n2, similarity))
+    expected.sort(key=lambda pair: (-pair[2], pair[0], pair[1]))
+
+    pairs = analyzer.find_resonant_pairs(start, end)
+    assert [pair[:2] for pair in pairs] == [pair[:2] for pair in expected]
+    assert np.allclose([pair[2] for pair in pairs], [pair[2] for pair in expected], rtol=1e-12, atol=0)
+    assert analyzer.find_resonant_pairs(start, end, top=10) == pairs[:10]
+    assert sorted(analyzer.iter_resonant_pairs(start, end)) == sorted(pairs)
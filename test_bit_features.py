@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for per-value bit features of trajectories.
+"""
+
+import math
+
+import numpy as np
+
+from analysis import bit_features
+from analysis.bit_features import FEATURES, trajectory_features, batch_features
+from test_trajectory_engine import reference_trajectory
+
+def test_bit_features(monkeypatch):
+    """Array bit features equal the per-value bin() string loops they replace."""
+    def reference(x):
+        binary = bin(x)[2:]
+        ones = binary.count('1')
+        positions = [i for i, bit in enumerate(reversed(binary)) if bit == '1']
+        if 0 < ones < len(binary):
+            p1 = ones / len(binary)
+            entropy = -(p1 * math.log2(p1) + (1 - p1) * math.log2(1 - p1))
+        else:
+            entropy = 0.0
+        return {
+            'bit_length': len(binary), 'popcount': ones, 'density': ones / len(binary),
+            'entropy': entropy, 'information': len(binary) * entropy,
+            'center_of_mass': sum(positions) / len(positions) if positions else 0
+        }
+
+    trajectories = [reference_trajectory(n) for n in (1, 27, 2**70 + 1)]
+    for trajectory, features in zip(trajectories, batch_features(trajectories)):
+        single = trajectory_features(trajectory)
+        for name in FEATURES:
+            expected = [reference(x)[name] for x in trajectory]
+            assert np.allclose(features[name], expected), name
+            assert np.array_equal(single[name], features[name]), name
+
+    # Position sums computed a few rows at a time give the same features
+    whole = trajectory_features(trajectories[2])
+    monkeypatch.setattr(bit_features, 'POSITION_BLOCK', 100)
+    blocked = trajectory_features(trajectories[2])
+    assert all(np.array_equal(blocked[name], whole[name]) for name in FEATURES)
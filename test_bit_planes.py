@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Tests for bit-plane unpacking of trajectories.
+"""
+
+import numpy as np
+
+from analysis.bit_planes import bit_planes, batch_bit_planes
+from test_trajectory_engine import reference_trajectory
+
+def test_bit_planes():
+    """Unpacked bit planes equal the zero-filled bin() strings they replace."""
+    def reference(values, width):
+        return [[int(c) for c in bin(v & ((1 << width) - 1))[2:].zfill(width)] for v in values]
+
+    trajectory = reference_trajectory(27)
+    assert bit_planes(trajectory).tolist() == reference(trajectory, max(v.bit_length() for v in trajectory))
+    assert bit_planes(trajectory[:50], 20).tolist() == reference(trajectory[:50], 20)
+
+    wide = [3**100, 0, 2**64, 2**64 - 1, 7]
+    assert bit_planes(wide).tolist() == reference(wide, (3**100).bit_length())
+    assert bit_planes(wide, 70, msb_first=False).tolist() == [row[::-1] for row in reference(wide, 70)]
+    assert bit_planes(wide).dtype == np.uint8
+
+    trajectories = [reference_trajectory(n) for n in (7, 27, 2**65 + 1)]
+    stack = batch_bit_planes(trajectories, 72)
+    assert stack.shape == (3, max(len(t) for t in trajectories), 72)
+    for planes, trajectory in zip(stack, trajectories):
+        assert planes[:len(trajectory)].tolist() == reference(trajectory, 72)
+        assert not planes[len(trajectory):].any()
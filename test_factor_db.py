@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent cyclotomic factor database.
+"""
+
+import math
+import os
+import tempfile
+
+from analysis.multiplicative_order import factorize
+from analysis.factor_db import FactorDatabase, cyclotomic_value
+from analysis.prime_sweep import is_prime
+
+def test_factor_database():
+    """Cyclotomic factorisations of s_n are complete, persisted and reused."""
+    assert [cyclotomic_value(d) for d in (1, 2, 3, 6, 10, 12)] == [1, 3, 7, 3, 11, 13]
+    path = os.path.join(tempfile.mkdtemp(), 'factors.sqlite')
+    database = FactorDatabase(path)
+    for n in range(30):
+        s_n = (2**(2 * n + 1) + 1) // 3
+        factors = database.factorization(n)
+        assert math.prod(p**k for p, k in factors.items()) == s_n
+        assert all(factorize(p) == {p: 1} for p in factors if p < 2**26)
+        assert database.totient(n) == math.prod(p**(k - 1) * (p - 1) for p, k in factors.items())
+        assert database.is_prime(n) == (factors == {s_n: 1})
+    assert database.certificate(4).startswith("factorization")
+    assert database.is_prime(202) is False and database.certificate(202) == "algebraic factor Phi_6(2)"
+    database.close()
+
+    reopened = FactorDatabase(path)
+    assert reopened.factorization(7) == {3: 1, 11: 1, 331: 1}
+    assert reopened.connection.execute("SELECT COUNT(*) FROM cyclotomic").fetchone()[0] > 0
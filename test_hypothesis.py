@@ -8,54 +8,40 @@ have special properties for Collatz sequences.
 import numpy as np
 from scipy import stats
 import matplotlib.pyplot as plt
-from collections import defaultdict
+from analysis.stopping_times import default_table, persist_default_table
+from analysis.alignment import AlignmentAccumulator
+from analysis.null_distribution import null_distribution
+from analysis.shift_sequence import SHIFTS
+from analysis.shift_window import OddWindow, random_odd, shift_window
 
 def get_shift(n):
     """Calculate the nth shift value: s_n = (2^(2n+1) + 1)/3"""
-    return (2**(2*n + 1) + 1) // 3
+    return SHIFTS[n]
 
 def trailing_zeros(num):
     """Count trailing zeros in binary representation"""
     if num == 0:
         return 0
-    count = 0
-    while num % 2 == 0:
-        count += 1
-        num //= 2
-    return count
+    return (num & -num).bit_length() - 1
 
 def analyze_trailing_zeros_at_shift(shift, sample_size=100000):
     """
     Analyze trailing zero distributions at a given shift value.
     Returns statistics about alignment between n+1 and 3n+1 patterns.
     """
-    # Distribution of trailing zeros for n+1
-    dist_n_plus_1 = defaultdict(int)
-    # Distribution of trailing zeros for 3n+1
-    dist_3n_plus_1 = defaultdict(int)
-    # Joint distribution
-    joint_dist = defaultdict(int)
-    
-    # Sample odd numbers around the shift
-    for offset in range(-sample_size//2, sample_size//2):
-        n = shift + 2 * offset  # Keep n odd
-        if n > 0:
-            tz_n_plus_1 = trailing_zeros(n + 1)
-            tz_3n_plus_1 = trailing_zeros(3 * n + 1)
-            
-            dist_n_plus_1[tz_n_plus_1] += 1
-            dist_3n_plus_1[tz_3n_plus_1] += 1
-            joint_dist[(tz_n_plus_1, tz_3n_plus_1)] += 1
+    # Marginal and joint distributions of v2(n+1) and v2(3n+1) over the
+    # odd numbers n = shift + 2*offset > 0 around the shift, streamed in chunks
+    window = shift_window(shift, sample_size)
+    accumulator = AlignmentAccumulator()
+    accumulator.add_window(shift, window.first_offset, len(window))
+    counts_n_plus_1, counts_3n_plus_1 = accumulator.marginals()
+    dist_n_plus_1 = {int(k): int(counts_n_plus_1[k]) for k in np.nonzero(counts_n_plus_1)[0]}
+    dist_3n_plus_1 = {int(k): int(counts_3n_plus_1[k]) for k in np.nonzero(counts_3n_plus_1)[0]}
+    joint_dist = {(int(k1), int(k2)): int(accumulator.joint[k1, k2])
+                  for k1, k2 in zip(*np.nonzero(accumulator.joint))}
     
     # Calculate mutual information
-    total = sum(joint_dist.values())
-    mi = 0
-    for (k1, k2), count in joint_dist.items():
-        p_joint = count / total
-        p_k1 = dist_n_plus_1[k1] / total
-        p_k2 = dist_3n_plus_1[k2] / total
-        if p_joint > 0:
-            mi += p_joint * np.log2(p_joint / (p_k1 * p_k2))
+    mi = accumulator.mutual_information()
     
     return {
         'mutual_information': mi,
@@ -64,10 +50,11 @@ def analyze_trailing_zeros_at_shift(shift, sample_size=100000):
         'joint_dist': dict(joint_dist)
     }
 
-def compare_shift_to_random(n, num_random=100):
+def compare_shift_to_random(n, num_random=100, workers=1, seed=None):
     """
     Compare the special shift s_n to random odd values.
     Tests if the shift has statistically significant properties.
+    The null draws are seeded from `seed` and may run on several workers.
     """
     shift = get_shift(n)
     print(f"\nAnalyzing shift s_{n} = {shift} = {bin(shift)}")
@@ -76,13 +63,12 @@ def compare_shift_to_random(n, num_random=100):
     shift_results = analyze_trailing_zeros_at_shift(shift)
     shift_mi = shift_results['mutual_information']
     
-    # Analyze at random odd values for comparison
-    random_mis = []
-    for _ in range(num_random):
-        # Random odd number in similar range
-        random_odd = 2 * np.random.randint(shift//2, shift*2) + 1
-        random_results = analyze_trailing_zeros_at_shift(random_odd, sample_size=10000)
-        random_mis.append(random_results['mutual_information'])
+    # Analyze at random odd values in a similar range, all draws batched
+    null = null_distribution(shift, num_draws=num_random, sample_size=10000,
+                             workers=workers, seed=seed)
+    random_mis = null['mutual_information']
+    print(f"Null distribution: {num_random} draws in {null['seconds']:.2f}s "
+          f"({null['samples_per_second']:,.0f} samples/s)")
     
     # Statistical test
     mean_random = np.mean(random_mis)
@@ -117,22 +103,18 @@ def test_collatz_trajectories_at_shifts(max_n=5):
         shift = get_shift(n)
         print(f"\nShift s_{n} = {shift}")
         
-        # Test trajectory lengths near the shift
-        trajectory_lengths = []
-        for offset in range(-100, 101):
-            test_num = shift + 2 * offset  # Keep odd
-            if test_num > 0:
-                length = collatz_trajectory_length(test_num)
-                trajectory_lengths.append(length)
+        # Test trajectory lengths near the shift (odd window, test_num > 0)
+        window = OddWindow.around(shift, -100, 101)
+        trajectory_lengths = np.minimum(default_table().window(window.start, len(window))[0], 1000)
         
         mean_length = np.mean(trajectory_lengths)
         std_length = np.std(trajectory_lengths)
         
         # Compare to random odd numbers
-        random_lengths = []
-        for _ in range(1000):
-            random_odd = 2 * np.random.randint(1, 2*shift) + 1
-            random_lengths.append(collatz_trajectory_length(random_odd))
+        random_lengths = np.concatenate([
+            np.minimum(default_table().lookup_many(chunk)[0], 1000)
+            for chunk in random_odd(1, 2*shift, 1000)
+        ])
         
         random_mean = np.mean(random_lengths)
         random_std = np.std(random_lengths)
@@ -144,17 +126,12 @@ def test_collatz_trajectories_at_shifts(max_n=5):
         t_stat, p_value = stats.ttest_ind(trajectory_lengths, random_lengths)
         if p_value < 0.05:
             print(f"  *** Significant difference (p={p_value:.6f}) ***")
+    
+    persist_default_table()
 
 def collatz_trajectory_length(n):
     """Calculate the length of Collatz trajectory to reach 1"""
-    steps = 0
-    while n != 1 and steps < 1000:  # Safety limit
-        if n % 2 == 0:
-            n = n // 2
-        else:
-            n = 3 * n + 1
-        steps += 1
-    return steps
+    return min(default_table().lookup(n)[0], 1000)  # Safety limit
 
 def verify_mathematical_properties():
     """Verify the claimed mathematical properties of the shift sequence"""
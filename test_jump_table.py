@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Tests for the k-step jump table in analysis/jump_table.py.
+"""
+
+from analysis.trajectory_engine import UINT64_SAFE_LIMIT
+from analysis.stopping_times import StoppingTimeTable
+from analysis.jump_table import JumpTable
+from test_trajectory_engine import reference_summary
+
+def test_jump_table():
+    """k-step jumps give the same lengths, peaks and stopping times."""
+    jumps = JumpTable(k=8)
+    numbers = list(range(1, 3000)) + [2**64 - 1, UINT64_SAFE_LIMIT, 2**70 + 1, 3**50]
+    for n in numbers:
+        assert jumps.summary(n) == reference_summary(n), n
+    assert jumps.batch_total_stopping_times(numbers).tolist() == [reference_summary(n)[0] for n in numbers]
+
+    table = StoppingTimeTable(bound=2**10, max_bound=2**10)
+    table.jump_table = JumpTable(k=8, tail_table=table)
+    assert table.lookup(2**40 + 7) == reference_summary(2**40 + 7)
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Tests for multiplicative orders and factorisation.
+Orders are checked against repeated multiplication.
+"""
+
+import math
+
+from analysis.multiplicative_order import multiplicative_order, orders_of_two, factorize
+
+def reference_order(a, m):
+    """Multiplicative order by repeated multiplication."""
+    if math.gcd(a, m) != 1:
+        return None
+    order, current = 1, a % m
+    while current != 1 % m:
+        current = current * a % m
+        order += 1
+    return order
+
+def test_multiplicative_order():
+    """Exponent reduction and the vectorised prime sweep match brute force."""
+    for m in range(1, 1500):
+        for a in (2, 3, 10):
+            assert multiplicative_order(a, m) == reference_order(a, m), (a, m)
+    assert factorize(2**61 - 1) == {2**61 - 1: 1}
+    assert factorize(2**64 - 1) == {3: 1, 5: 1, 17: 1, 257: 1, 641: 1, 65537: 1, 6700417: 1}
+
+    primes, orders = orders_of_two(5000)
+    assert primes[0] == 3 and len(primes) == 668
+    assert orders.tolist() == [reference_order(2, p) for p in primes.tolist()]
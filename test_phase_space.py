@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Tests for phase points and attractor detection.
+Tree and grid lookups are checked against the all-pairs loops.
+"""
+
+import numpy as np
+
+from analysis.phase_space import phase_points, neighbour_counts, unique_points, find_attractors
+from test_trajectory_engine import reference_trajectory
+
+def test_phase_space():
+    """Tree neighbour counts and grid de-duplication equal the all-pairs loops."""
+    x, y, z = phase_points([reference_trajectory(n) for n in (27, 97, 871)])
+    points = np.column_stack((x, y))
+    assert len(points) == sum(len(reference_trajectory(n)) - 1 for n in (27, 97, 871))
+
+    distances = np.linalg.norm(points[:, None] - points[None, :], axis=2)
+    assert neighbour_counts(points).tolist() == ((distances < 0.1).sum(axis=1) - 1).tolist()
+
+    kept = []
+    for i in range(len(points)):
+        if all(np.any(np.abs(points[i] - points[j]) >= 0.05) for j in kept):
+            kept.append(i)
+    assert unique_points(points) == kept
+
+    expected = []
+    for i in range(len(points)):
+        nearby = (distances[i] < 0.1).sum() - 1
+        if nearby > len(points) * 0.1 and all(abs(x[i] - a['density']) >= 0.05 or
+                                              abs(y[i] - a['change_rate']) >= 0.05 for a in expected):
+            expected.append({'density': x[i], 'change_rate': y[i], 'width': z[i], 'strength': nearby})
+    assert find_attractors(x, y, z) == expected
+    assert neighbour_counts(np.zeros((0, 2))).tolist() == [] and unique_points(np.zeros((0, 2))) == []
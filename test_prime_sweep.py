@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Tests for primality testing and the prime-index sweep of s_n.
+"""
+
+import os
+import tempfile
+
+from analysis.multiplicative_order import factorize
+from analysis.prime_sweep import DETERMINISTIC_LIMIT, is_probable_prime, is_prime, sweep_prime_indices
+
+def test_prime_sweep():
+    """Sieved, pooled and resumed sweeps find exactly the prime s_n."""
+    small_primes = [p for p in range(2, 2000) if factorize(p) == {p: 1}]
+    assert [p for p in range(2000) if is_probable_prime(p)] == small_primes
+    assert not is_probable_prime(3215031751)  # strong pseudoprime to bases 2, 3, 5, 7
+    # The limit itself is a strong pseudoprime to every witness; BPSW rejects it
+    assert is_probable_prime(DETERMINISTIC_LIMIT) and not is_prime(DETERMINISTIC_LIMIT)
+    assert is_prime(2**127 - 1) and not is_prime((2**89 - 1) * (2**107 - 1))
+
+    expected = [1, 2, 3, 5, 6, 8, 9, 11, 15, 21, 30, 39, 50, 63, 83, 95, 99, 156, 173]
+    assert sweep_prime_indices(200) == expected
+    assert sweep_prime_indices(200, workers=2, batch_size=64) == expected
+    assert sweep_prime_indices(100, start=20) == [21, 30, 39, 50, 63, 83, 95, 99]
+
+    checkpoint = os.path.join(tempfile.mkdtemp(), 'sweep.json')
+    assert sweep_prime_indices(60, batch_size=16, checkpoint=checkpoint) == expected[:13]
+    assert sweep_prime_indices(200, batch_size=16, checkpoint=checkpoint) == expected
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Tests for the resonant-pair index.
+Indexed pairs are checked against the all-pairs comparison.
+"""
+
+import numpy as np
+
+from analysis.resonance_index import resonant_pair_blocks, resonant_pairs
+
+def test_resonance_index():
+    """Indexed resonant pairs equal the all-pairs comparison, whatever the block size."""
+    rng = np.random.default_rng(7)
+    numbers = list(range(100, 700))
+    fundamentals = rng.integers(0, 64, len(numbers)) / 128
+    centroids = rng.uniform(0, 0.5, len(numbers))
+
+    expected = set()
+    for i in range(len(numbers)):
+        for j in range(i + 1, len(numbers)):
+            if fundamentals[i] != 0 and fundamentals[j] != 0:
+                similarity = ((1 - abs(fundamentals[i] - fundamentals[j])) +
+                              (1 - abs(centroids[i] - centroids[j]))) / 2
+                if similarity > 0.9:
+                    expected.add((numbers[i], numbers[j], similarity))
+
+    pairs = list(resonant_pairs(numbers, fundamentals, centroids))
+    assert len(pairs) == len(set(pairs)) and set(pairs) == expected
+    blocks = list(resonant_pair_blocks(numbers, fundamentals, centroids, block=64))
+    assert sum(len(first) for first, _, _ in blocks) == len(expected)
+    assert all(len(first) <= 64 for first, _, _ in blocks)
+    assert len(list(resonant_pairs(numbers, fundamentals, centroids, threshold=0.99))) < len(expected)
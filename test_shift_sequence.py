@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Tests for the shift sequence s_n = (2^(2n+1)+1)/3.
+"""
+
+from analysis.shift_sequence import ShiftSequence
+
+def test_shift_sequence():
+    """Closed form, recurrence, slices and iteration all give (2^(2n+1)+1)/3."""
+    expected = [(2**(2 * n + 1) + 1) // 3 for n in range(300)]
+    shifts = ShiftSequence()
+    assert [ShiftSequence.closed_form(n) for n in range(300)] == expected
+    assert [shifts[n] for n in (5, 6, 7, 3, 299, 100, 101)] == [expected[n] for n in (5, 6, 7, 3, 299, 100, 101)]
+    assert shifts[10:20] == expected[10:20] and shifts[:9:4] == expected[:9:4]
+    assert [s for s, _ in zip(shifts, range(300))] == expected
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Tests for the odd-number window sampler in analysis/shift_window.py.
+"""
+
+import numpy as np
+
+from analysis.shift_window import OddWindow, shift_window, random_odd, matched_controls, as_ints
+
+def test_shift_window():
+    """Sampled windows and controls match the offset loops they replace."""
+    for shift, sample_size in ((11, 100), (683, 1001), (2**64 - 101, 300), ((2**129 + 1) // 3, 50)):
+        numbers = [shift + 2 * offset for offset in range(-sample_size // 2, sample_size // 2)
+                   if shift + 2 * offset > 0]
+        window = shift_window(shift, sample_size)
+        assert len(window) == len(numbers) and window.start == numbers[0]
+        chunks = list(window.chunks(chunk=64))
+        assert all(len(chunk) <= 64 for chunk in chunks)
+        assert [n for chunk in chunks for n in as_ints(chunk)] == numbers
+        assert isinstance(chunks[0], np.ndarray) == (numbers[-1] < 2**64)
+        assert as_ints(window.values()) == numbers
+    assert len(OddWindow.around(3, -100, 101)) == 102
+
+    for shift in (43, 2**70 + 1):
+        controls = [n for chunk in matched_controls(shift, 500, rng=7, chunk=128) for n in as_ints(chunk)]
+        assert len(controls) == 500 and all(n % 2 == 1 and shift <= n < 4 * shift + 1 for n in controls)
+        again = [n for chunk in matched_controls(shift, 500, rng=7, chunk=128) for n in as_ints(chunk)]
+        assert controls == again
+    assert set(np.concatenate(list(random_odd(1, 3, 200, rng=0))).tolist()) == {3, 5}
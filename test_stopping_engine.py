@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for the watermark stopping-time engine.
+"""
+
+from analysis.stopping_times import StoppingTimeTable
+from analysis.stopping_engine import StoppingTimeEngine
+from test_trajectory_engine import reference_trajectory, reference_summary
+
+def test_stopping_engine():
+    """Early termination at the watermark gives exact, uncapped stopping times."""
+    engine = StoppingTimeEngine(StoppingTimeTable(bound=2**16, max_bound=2**16))
+    assert engine.watermark == 2**16
+
+    numbers = [27, 77031, 2**40 + 1, 3**50, 2**100 - 1]
+    totals, peaks, stopping = engine.lookup_many(numbers)
+    for n, total, peak, stop in zip(numbers, totals, peaks, stopping):
+        trajectory = reference_trajectory(n)
+        assert total == len(trajectory) - 1 and peak == max(trajectory)
+        assert stop == next(i for i, v in enumerate(trajectory) if v < n)
+    assert engine.total_stopping_time(2**100 - 1) == len(reference_trajectory(2**100 - 1)) - 1
+    assert max(totals) > 1000  # beyond the old 1,000-step cap
+
+    # Each sample costs its jumps plus one table read; building the tables counts too
+    assert engine.samples == 6 and engine.steps == int(totals.sum()) + int(totals[-1])
+    assert engine.table_reads == 6 and 0 < engine.jumps and engine.iterations < engine.steps
+    assert engine.build_steps == engine.table.build_steps + 16 * 2**16 > engine.steps
+    assert engine.speedup == engine.steps / (engine.iterations + engine.build_steps) < 1
+
+    # Verified results from the watermark upward raise it; a gap holds it back
+    table = StoppingTimeTable(bound=2**16, max_bound=2**17)
+    engine = StoppingTimeEngine(table)
+    engine.lookup_many(n for n in (2**16 + 3, 2**16 + 5, 2**70 + 1))  # any iterable, read once
+    assert engine.watermark == 2**16
+    engine.lookup(2**16 + 1)
+    assert engine.watermark == 2**16 + 6 and engine.absorbed == 3
+    window = engine.window(101, 2**15)[0]
+    assert window.tolist() == [len(reference_trajectory(n)) - 1 for n in range(101, 101 + 2**16, 2)]
+    assert engine.watermark == 100 + 2**16 and table.extensions[-1][1] == engine.watermark
+    for n in (2**16 + 1, 2**16 + 51, 99 + 2**16):
+        assert table.lookup(n) == reference_summary(n)
+    engine.reset_metrics()
+    assert engine.samples == 0 and engine.jumps == 0
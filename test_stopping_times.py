@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for the stopping-time table in analysis/stopping_times.py.
+Entries are checked against direct iteration of each start value.
+"""
+
+import os
+import tempfile
+
+from analysis import stopping_times
+from analysis.stopping_times import StoppingTimeTable
+from test_trajectory_engine import reference_summary
+
+def test_stopping_time_table():
+    """Table entries, window slices, extension and persistence."""
+    table = StoppingTimeTable(bound=2**12, max_bound=2**14)
+    for n in list(range(1, 3000)) + [2**13 + 1, 2**15 + 3, 2**70 + 1]:
+        assert table.lookup(n) == reference_summary(n), n
+    # Lookups beyond the bound walk down into the table; growth is explicit
+    assert table.bound == 2**12 and table.extensions == [(1, 2**12)]
+    assert table.extend(2**16) == 2**13 - 2**11
+    assert table.bound == 2**14 and table.extensions[-1] == (2**12, 2**14)
+    assert table.nbytes == 2**13 * (table.total.itemsize + table.stopping.itemsize + 8)
+
+    growing = StoppingTimeTable(bound=2**10, max_bound=2**12, auto_extend=True)
+    assert growing.lookup(2**11 + 1) == reference_summary(2**11 + 1)
+    assert growing.bound == 2**12 and growing.extensions[-1] == (2**10, 2**12)
+
+    total, peaks, stopping = table.window(101, 50)
+    expected = [reference_summary(n) for n in range(101, 201, 2)]
+    assert total.tolist() == [e[0] for e in expected]
+    assert peaks.tolist() == [e[1] for e in expected]
+    assert stopping.tolist() == [e[2] for e in expected]
+
+    numbers = [2, 6, 27, 2**14 + 5]
+    total, peaks, stopping = table.lookup_many(numbers)
+    assert total.tolist() == [reference_summary(n)[0] for n in numbers]
+
+    path = os.path.join(tempfile.mkdtemp(), 'table.npz')
+    table.save(path)
+    loaded = StoppingTimeTable.load(path)
+    assert loaded.bound == table.bound
+    assert (loaded.total == table.total).all() and (loaded.peaks == table.peaks).all()
+
+def test_default_table_persistence(monkeypatch):
+    """The shared table is saved after it is first built or extended, then reloaded."""
+    path = os.path.join(tempfile.mkdtemp(), 'stopping_times.npz')
+    monkeypatch.setattr(stopping_times, 'DEFAULT_TABLE_PATH', path)
+    monkeypatch.setattr(stopping_times, '_default_table', None)
+    built = stopping_times.default_table()
+    stopping_times.persist_default_table()
+    assert StoppingTimeTable.load(path).bound == built.bound
+
+    built.extend(2 * built.bound)
+    stopping_times.persist_default_table()
+    monkeypatch.setattr(stopping_times, '_default_table', None)
+    loaded = stopping_times.default_table()
+    assert loaded is not built and loaded.bound == built.bound == loaded._saved_bound
+    assert (loaded.total == built.total).all() and (loaded.peaks == built.peaks).all()
+    assert loaded.lookup(2**40 + 7) == reference_summary(2**40 + 7)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming moments, histograms and two-sample tests.
+Results are checked against SciPy on the stored samples.
+"""
+
+import math
+
+import numpy as np
+
+from analysis.streaming_stats import RunningMoments, LogHistogram, welch_ttest, variance_ftest
+
+def test_streaming_stats():
+    """Chunked, merged moments give the same tests as the stored samples."""
+    from scipy import stats
+    rng = np.random.default_rng(3)
+    a, b = rng.normal(50, 9, 5000), rng.normal(51, 10, 3000)
+
+    streamed, merged = RunningMoments(), RunningMoments()
+    for chunk in np.array_split(a, 7):
+        streamed.update(chunk)
+    for chunk in np.array_split(b, 3):
+        merged.merge(RunningMoments().update(chunk))
+    assert streamed.count == 5000 and math.isclose(streamed.mean, a.mean())
+    assert math.isclose(streamed.variance(), np.var(a)) and math.isclose(merged.variance(ddof=1), np.var(b, ddof=1))
+
+    t, p = welch_ttest(streamed, merged)
+    expected_t, expected_p = stats.ttest_ind(a, b, equal_var=False)
+    assert math.isclose(t, expected_t) and math.isclose(p, expected_p)
+    f_stat, f_p = variance_ftest(streamed, merged)
+    assert math.isclose(f_stat, np.var(a) / np.var(b))
+    assert math.isclose(f_p, stats.f.sf(np.var(a) / np.var(b), 4999, 2999))
+
+    histogram = LogHistogram()
+    histogram.update(np.array([1, 2, 100, 10**6], dtype=np.uint64))
+    histogram.merge(LogHistogram().update(np.array([3**400, 7], dtype=object)))
+    assert histogram.counts.sum() == 6 and histogram.counts[0] == 1
+    assert histogram.counts[-1] == 1  # log(3^400) is past the last edge and is clipped into it
+    logs = [math.log(v) for v in (1, 2, 100, 10**6, 3**400, 7)]
+    assert math.isclose(histogram.moments.mean, sum(logs) / 6)
+    assert histogram.quantile(0.5) == 2.0  # third smallest is log 7 = 1.95, in the bin [1.75, 2.0)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched theorem verification harness.
+"""
+
+from analysis.theorem_harness import verify_theorems
+
+def test_theorem_harness():
+    """Batched theorem checks pass, stop at counterexamples and respect budgets."""
+    serial = verify_theorems(max_n=3000, batch_size=700)
+    pooled = verify_theorems(max_n=3000, batch_size=700, workers=2)
+    for name in ('2.2', '2.3', '2.4', '2.5', '4.1'):
+        for reports in (serial, pooled):
+            assert reports[name]['counterexample'] is None
+            assert reports[name]['verified_to'] == 3000
+            assert reports[name]['values'] == (3001 if name == '2.2' else 3000)
+            assert reports[name]['complete']
+
+    # Theorem 3.1 as stated fails at once: ord_5(2) = 4 divides 4 but not 2, yet 5 does not divide s_1 = 3
+    for reports in (serial, pooled):
+        counterexample = reports['3.1']['counterexample']
+        assert (counterexample['n'], counterexample['p'], counterexample['divides']) == (1, 5, False)
+        assert reports['3.1']['verified_to'] == 0 and reports['3.1']['values'] == 1
+
+    budgeted = verify_theorems(['2.2'], max_n=3000, batch_size=100, time_budget=0)
+    assert budgeted['2.2']['verified_to'] == -1 and not budgeted['2.2']['complete']
+    budgeted = verify_theorems(['4.1'], max_n=3000, time_budget=0)
+    assert (budgeted['4.1']['verified_to'], budgeted['4.1']['values']) == (0, 0)
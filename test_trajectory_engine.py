@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared trajectory engine in analysis/.
+Every fast path is checked against the plain step-by-step definition.
+"""
+
+from analysis.trajectory_engine import (
+    UINT64_SAFE_LIMIT, collatz_step, get_trajectory,
+    batch_trajectories, batch_statistics
+)
+from analysis import trajectory_cache
+from analysis.trajectory_cache import TrajectoryCache
+
+def reference_trajectory(n, max_steps=None):
+    """Textbook trajectory, one step at a time."""
+    trajectory = [n]
+    while n != 1 and (max_steps is None or len(trajectory) < max_steps):
+        n = 3 * n + 1 if n % 2 else n // 2
+        trajectory.append(n)
+    return trajectory
+
+def test_single_trajectories():
+    """get_trajectory matches the definition, including truncation."""
+    assert collatz_step(27) == 82
+    assert collatz_step(82) == 41
+    assert len(get_trajectory(27)) == 112
+    assert max(get_trajectory(27)) == 9232
+    for n in range(1, 500):
+        for max_steps in (None, 1, 7, 100):
+            assert get_trajectory(n, max_steps) == reference_trajectory(n, max_steps)
+
+def test_batch_matches_single():
+    """Lockstep batches agree with per-seed trajectories, across the uint64 escape."""
+    starts = list(range(1, 2000)) + [
+        UINT64_SAFE_LIMIT, UINT64_SAFE_LIMIT - 2, 2**64 - 1, 2**80 + 1, 27
+    ]
+    for max_steps in (None, 1, 2, 150):
+        expected = [reference_trajectory(n, max_steps) for n in starts]
+        assert batch_trajectories(starts, max_steps) == expected
+
+        lengths, peaks = batch_statistics(starts, max_steps)
+        assert lengths.tolist() == [len(t) for t in expected]
+        assert peaks == [max(t) for t in expected]
+
+def test_trajectory_cache(monkeypatch):
+    """Cache shares suffixes, counts hits/misses and stays within its budget."""
+    cache = TrajectoryCache()
+    assert cache.trajectory(27) == reference_trajectory(27)
+    assert cache.trajectory(27) == reference_trajectory(27)
+    assert cache.trajectory(41, 10) == reference_trajectory(41, 10)
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (2, 1)
+    # 41 lies on the trajectory of 27: no new nodes were needed
+    assert len(cache) == len(reference_trajectory(27)) - 1
+
+    small = TrajectoryCache(max_bytes=4096)
+    small.prefetch(range(1, 300))
+    for n in range(1, 300):
+        assert small.trajectory(n) == reference_trajectory(n)
+    stats = small.stats()
+    assert stats['bytes_used'] <= 4096
+    assert stats['evictions'] > 0
+
+    # Prefetch stops each seed at its first cached value; large values are accounted
+    shared = TrajectoryCache()
+    shared.trajectory(27)
+    before = shared.stats()['bytes_used']
+    shared.prefetch([54, 2**90 + 1])
+    assert len(shared) == len(set(reference_trajectory(54) + reference_trajectory(2**90 + 1)) - {1})
+    assert shared.stats()['bytes_used'] - before > len(reference_trajectory(2**90 + 1)) * 28
+    assert shared.trajectory(2**90 + 1, 40) == reference_trajectory(2**90 + 1, 40)
+    assert batch_trajectories([54, 2**90 + 1], stop={27}) == [[54, 27], reference_trajectory(2**90 + 1)]
+
+    # Many prefetch chunks share one sorted index, re-sorted only after evictions
+    monkeypatch.setattr(trajectory_cache, 'PREFETCH_CHUNK', 16)
+    for budget in (2**30, 8192):
+        chunked = TrajectoryCache(max_bytes=budget)
+        chunked.prefetch(list(range(1, 400)) + [2**64 + 1, 2**64 - 1])
+        for n in list(range(1, 400)) + [2**64 + 1, 2**64 - 1]:
+            assert chunked.trajectory(n) == reference_trajectory(n)
+        assert (chunked.stats()['misses'] == 0) == (budget == 2**30)
+
+def reference_summary(n):
+    """(total stopping time, peak, stopping time) by direct iteration."""
+    trajectory = reference_trajectory(n)
+    below = [i for i, x in enumerate(trajectory) if x < n]
+    return len(trajectory) - 1, max(trajectory), below[0] if below else 0
@@ -14,6 +14,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from analysis.binary_analyzer import CollatzBinaryAnalyzer
+from analysis.bit_planes import bit_planes
 
 class BinaryPatternVisualizer:
     def __init__(self):
@@ -27,14 +28,9 @@ class BinaryPatternVisualizer:
         """Create a heatmap of binary representations through trajectory"""
         trajectory = self.analyzer.get_trajectory(n)[:max_steps]
         
-        # Prepare binary matrix
+        # Prepare binary matrix (rows: steps, columns: MSB to LSB)
         max_bits = max(x.bit_length() for x in trajectory)
-        binary_matrix = np.zeros((len(trajectory), max_bits))
-        
-        for i, num in enumerate(trajectory):
-            binary_str = bin(num)[2:].zfill(max_bits)
-            for j, bit in enumerate(binary_str):
-                binary_matrix[i, j] = int(bit)
+        binary_matrix = bit_planes(trajectory, max_bits)
         
         # Create visualization
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 8))
@@ -67,15 +63,18 @@ class BinaryPatternVisualizer:
         # Sample numbers for analysis
         numbers = np.linspace(start, end, sample_size, dtype=int)
         
-        # Calculate features for each number
+        # Calculate features for each number (resonance scored in one batch)
+        self.analyzer.prefetch_trajectories(numbers.tolist())
+        trajectories = [self.analyzer.get_trajectory(int(n)) for n in numbers]
+        resonance = self.analyzer.resonance_scores(trajectories)
         features = []
-        for n in numbers:
-            analysis = self.analyzer.binary_analysis(n)
+        for trajectory, score in zip(trajectories, resonance):
+            hamming_weights = [x.bit_count() for x in trajectory]
             features.append([
-                analysis['trajectory_length'],
-                analysis['resonance_score'],
-                max(analysis['hamming_weights']),
-                np.mean(analysis['hamming_weights'])
+                len(trajectory),
+                score,
+                max(hamming_weights),
+                np.mean(hamming_weights)
             ])
         
         features = np.array(features)
@@ -128,20 +127,19 @@ class BinaryPatternVisualizer:
         
         # Bit transition diagram
         max_bits = max(x.bit_length() for x in trajectory)
+        planes = bit_planes(trajectory, max_bits)
+        changed = planes[:-1] != planes[1:]
         
         for i in range(len(trajectory) - 1):
-            curr_bits = bin(trajectory[i])[2:].zfill(max_bits)
-            next_bits = bin(trajectory[i+1])[2:].zfill(max_bits)
-            
-            for j, (cb, nb) in enumerate(zip(curr_bits, next_bits)):
-                if cb != nb:
+            for j, cb in enumerate(planes[i]):
+                if changed[i, j]:
                     # Bit changed
-                    color = 'red' if cb == '1' else 'green'
+                    color = 'red' if cb else 'green'
                     ax1.arrow(i, j, 0.8, 0, head_width=0.3, head_length=0.1,
                              fc=color, ec=color, alpha=0.5)
                 
                 # Draw the bits
-                color = 'black' if cb == '1' else 'lightgray'
+                color = 'black' if cb else 'lightgray'
                 ax1.add_patch(patches.Rectangle((i-0.4, j-0.4), 0.8, 0.8,
                                                facecolor=color, alpha=0.7))
         